@@ -1,14 +1,22 @@
 # config.py
 
+import atexit
 import contextlib
 import io
 import json
 import logging
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -56,6 +64,12 @@ DEEPSEEK_MODEL = os.getenv("DEEPSEEK_MODEL", "deepseek-v4-pro")
 
 # --- TTS SERVICE RATE LIMIT CONFIGURATION ---
 GEMINI_TTS_WAIT_SECONDS = 6.0
+# Client-side request budget (requests per minute) shared by all workers of a
+# service; services not listed here (or set to 0) are not throttled.
+# The Gemini default is the free-tier TTS cap; raise it (or set 0) on paid tiers
+TTS_REQUESTS_PER_MINUTE = {
+    "gemini": float(os.getenv("GEMINI_TTS_RPM", "15")),
+}
 
 # --- TTS MULTIPROCESSING CONFIGURATION ---
 # Default to 1 for services without a specific config
@@ -65,11 +79,37 @@ TTS_PROCESS_CONFIG = {
     "kokoro": 2,  # Added support for Kokoro
     "mac_say": 10,  # Configured to 10
     "elevenlabs": 2,  # Configured to 2
-    "gemini": 3,  # Increased to 3 for parallel generation
+    "gemini": 6,  # Paced by TTS_REQUESTS_PER_MINUTE, so more workers are safe
 }
 
 AUDIO_MODE_ORDER = ["kokoro_mlx", "kokoro", "mac_say", "elevenlabs", "gemini"]
 
+# Persistent per-service TTS worker pools, created on first use and reused
+# across reels instead of being rebuilt for every generation call.
+_TTS_EXECUTORS = {}
+_TTS_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_tts_executor(service):
+    """Returns the shared ThreadPoolExecutor for a TTS service, sized by TTS_PROCESS_CONFIG."""
+    with _TTS_EXECUTORS_LOCK:
+        executor = _TTS_EXECUTORS.get(service)
+        if executor is None:
+            num_workers = max(1, TTS_PROCESS_CONFIG.get(service, DEFAULT_TTS_PROCESSES))
+            executor = ThreadPoolExecutor(
+                max_workers=num_workers, thread_name_prefix=f"tts-{service}"
+            )
+            _TTS_EXECUTORS[service] = executor
+        return executor
+
+
+def _shutdown_tts_executors():
+    for executor in _TTS_EXECUTORS.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_shutdown_tts_executors)
+
 
 # --- DIRECTORY CONFIGURATION ---
 # Determine project root (assuming this file is in backend/config.py)
@@ -131,6 +171,7 @@ AUDIO_MODES_FOR_PLATFORM = (
 )
 
 # --- HARDWARE ACCELERATION CONFIGURATION ---
+# (NVENC is probed lazily by the reel generator, not at import)
 if IS_MAC:
     # Use h264_videotoolbox for macOS hardware acceleration
     VIDEO_CODEC = "h264_videotoolbox"
@@ -139,14 +180,25 @@ else:
     VIDEO_CODEC = "libx264"
 
 # --- WHISPER DEVICE CONFIGURATION ---
-import torch
+# Resolved lazily so processes that never run Whisper don't pay for importing torch
+_WHISPER_DEVICE = None
+
+
+def get_whisper_device():
+    """Returns the torch device for Whisper ("mps", "cuda" or "cpu"), memoized."""
+    global _WHISPER_DEVICE
+    if _WHISPER_DEVICE is None:
+        if IS_MAC:
+            _WHISPER_DEVICE = "mps"
+        else:
+            try:
+                import torch
+
+                _WHISPER_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+            except ImportError:
+                _WHISPER_DEVICE = "cpu"
+    return _WHISPER_DEVICE
 
-if IS_MAC:
-    WHISPER_DEVICE = "mps"
-elif torch.cuda.is_available():
-    WHISPER_DEVICE = "cuda"
-else:
-    WHISPER_DEVICE = "cpu"
 
 # --- AVATAR DISPLAY CONFIGURATION ---
 AVATAR_WIDTH = 800
@@ -154,11 +206,29 @@ AVATAR_Y_POS = 1920  # Y position for the avatars on screen
 
 # --- CHARACTER CONFIGURATION (DYNAMICALLY LOADED) ---
 # Load character/voice/avatar mapping from a central file
+def load_json_file(path):
+    """Reads and parses a JSON file, using orjson when it is installed.
+
+    Raises json.JSONDecodeError on invalid input (orjson's error subclasses it).
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 CHARACTER_MAP = {}
 try:
     if os.path.exists(CHARACTER_CONFIG_FILE):
-        with open(CHARACTER_CONFIG_FILE, "r") as f:
-            CHARACTER_MAP = json.load(f)
+        # Intern names and voice ids: they are looked up and hashed per turn
+        CHARACTER_MAP = {
+            sys.intern(name): {
+                key: sys.intern(value) if isinstance(value, str) else value
+                for key, value in details.items()
+            }
+            for name, details in load_json_file(CHARACTER_CONFIG_FILE).items()
+        }
     else:
         # print(
         #     f"Error: Character config file '{CHARACTER_CONFIG_FILE}' not found. Using empty map."
@@ -170,16 +240,96 @@ except json.JSONDecodeError:
     )
 
 
+# --- FILESYSTEM UTILITIES ---
+def fast_rmtree(path):
+    """Recursively deletes a directory using os.scandir's cached entry types,
+    avoiding the extra stat() per entry that shutil.rmtree's walk performs."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
+
+
 # --- UTILITY CONTEXT MANAGER ---
+# Redirection is process-wide (sys.stdout/sys.stderr and fds 1/2 are shared by
+# all threads), so nested or concurrent users share one redirect: the first to
+# enter installs it and the last to leave restores the original streams.
+_suppress_lock = threading.Lock()
+_suppress_depth = 0
+_suppress_saved = None
+_suppress_fd_depth = 0
+_suppress_saved_fds = None
+
+
+def _flush_std_streams():
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+
+
+def _redirect_fds_to_devnull():
+    """Points fds 1 and 2 at /dev/null; returns what is needed to restore them."""
+    saved_fds = None
+    try:
+        devnull_fd = os.open(os.devnull, os.O_WRONLY)
+        saved_fds = (os.dup(1), os.dup(2), devnull_fd)
+        os.dup2(devnull_fd, 1)
+        os.dup2(devnull_fd, 2)
+    except OSError:
+        # No real fds to redirect (e.g. detached console); Python-level only
+        if saved_fds:
+            for fd in saved_fds:
+                os.close(fd)
+        saved_fds = None
+    return saved_fds
+
+
+def _restore_fds(saved_fds):
+    saved_out, saved_err, devnull_fd = saved_fds
+    os.dup2(saved_out, 1)
+    os.dup2(saved_err, 2)
+    os.close(saved_out)
+    os.close(saved_err)
+    os.close(devnull_fd)
+
+
 @contextlib.contextmanager
-def suppress_output():
-    """Context manager to suppress stdout and stderr."""
-    save_stdout = sys.stdout
-    save_stderr = sys.stderr
-    sys.stdout = io.StringIO()
-    sys.stderr = io.StringIO()
+def suppress_output(fds=False):
+    """Context manager to suppress stdout and stderr.
+
+    With fds=True, output that native code writes directly to fds 1 and 2 is
+    silenced as well. That covers the whole process (uvicorn and bot logging
+    included), so only use it around short native calls that really need it.
+    """
+    global _suppress_depth, _suppress_saved, _suppress_fd_depth, _suppress_saved_fds
+
+    with _suppress_lock:
+        if _suppress_depth == 0:
+            _flush_std_streams()
+            _suppress_saved = (sys.stdout, sys.stderr)
+            sys.stdout = io.StringIO()
+            sys.stderr = io.StringIO()
+        _suppress_depth += 1
+        if fds:
+            if _suppress_fd_depth == 0:
+                _suppress_saved_fds = _redirect_fds_to_devnull()
+            _suppress_fd_depth += 1
     try:
         yield
     finally:
-        sys.stdout = save_stdout
-        sys.stderr = save_stderr
+        with _suppress_lock:
+            if fds:
+                _suppress_fd_depth -= 1
+                if _suppress_fd_depth == 0 and _suppress_saved_fds:
+                    _restore_fds(_suppress_saved_fds)
+                    _suppress_saved_fds = None
+            _suppress_depth -= 1
+            if _suppress_depth == 0:
+                sys.stdout, sys.stderr = _suppress_saved
+                _suppress_saved = None
+                _flush_std_streams()
@@ -1,11 +1,16 @@
 # main.py
 
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import multiprocessing
 import os
-import shutil
 import signal
 import socket
 import subprocess
+import sys
+import threading
 import time
 import warnings
 
@@ -17,12 +22,12 @@ load_dotenv()
 # Import logic with fallback for package vs direct execution
 try:
     from . import server
-    from .config import TEMP_DIR, WEB_APP_OUT_DIR
-    from .telegram_bot import start_bot
+    from .config import IS_MAC, TEMP_DIR, WEB_APP_OUT_DIR, fast_rmtree
+    from .telegram_bot import start_bot_async
 except ImportError:
     import server
-    from config import TEMP_DIR, WEB_APP_OUT_DIR
-    from telegram_bot import start_bot
+    from config import IS_MAC, TEMP_DIR, WEB_APP_OUT_DIR, fast_rmtree
+    from telegram_bot import start_bot_async
 
 
 # Suppress resource_tracker warning
@@ -35,97 +40,335 @@ FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "we
 
 FRONTEND_COMMAND = ["bun", "run", "dev"]  # Kept as backup/reference
 FRONTEND_BUILD_COMMAND = ["bun", "run", "build"]
+# Inputs whose changes require a rebuild of the static export
+FRONTEND_SOURCES = [
+    "app",
+    "components",
+    "hooks",
+    "lib",
+    "types",
+    "public",
+    "package.json",
+    "bun.lock",
+    "next.config.ts",
+    "tailwind.config.js",
+    "postcss.config.mjs",
+    "tsconfig.json",
+]
+FRONTEND_BUILD_STAMP = os.path.join(WEB_APP_OUT_DIR, ".build_stamp")
 FRONTEND_URL = "http://localhost:8008"  # Updated to backend port
 BACKEND_URL = "http://127.0.0.1:8008"
 
-# --- TELEGRAM BOT CONFIGURATION ---
-START_HOUR = 10
-END_HOUR = 3
-MESSAGE_TEXT = (
-    f"🌐 Faceless Reel Generator Web UI is running!\n\nAccess it here: {FRONTEND_URL}"
-)
-# --- END TELEGRAM BOT CONFIGURATION ---
+# --- MULTIPROCESSING CONFIGURATION ---
+# The dev server child is forked from the single-threaded forkserver rather
+# than from this process, which runs the event loop and helper threads
+# (forking a threaded process is unsafe and warns since Python 3.12). Children
+# still re-import the main module, so they start no faster than with fork.
+# Platforms without forkserver (Windows) use their default.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    MP_CONTEXT = multiprocessing.get_context("forkserver")
+else:
+    MP_CONTEXT = multiprocessing.get_context()
 
 # --- UTILITIES ---
 
 
-def kill_port_processes(ports):
-    """Kills any process running on the specified ports."""
+PROC_NET_TCP_FILES = ("/proc/net/tcp", "/proc/net/tcp6")
+TCP_LISTEN_STATE = "0A"
+
+
+def _listening_sockets_linux(ports):
+    """
+    Returns {"socket:[inode]": port} for LISTEN sockets on the given ports,
+    parsed from /proc/net/tcp{,6}. Returns None if /proc is unavailable.
+    """
+    wanted_inodes = {}
+    try:
+        for table in PROC_NET_TCP_FILES:
+            if not os.path.exists(table):
+                continue
+            with open(table, "r") as f:
+                next(f, None)  # Skip header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 10 or fields[3] != TCP_LISTEN_STATE:
+                        continue
+                    port = int(fields[1].rsplit(":", 1)[1], 16)
+                    if port in ports:
+                        wanted_inodes[f"socket:[{fields[9]}]"] = port
+    except OSError:
+        return None
+    return wanted_inodes
+
+
+def _pids_listening_on_linux(ports):
+    """
+    Maps each port to the PIDs listening on it by reading /proc directly.
+    Avoids a fork+exec of lsof per port. Returns None if /proc is unavailable.
+    """
+    wanted_inodes = _listening_sockets_linux(ports)
+    if wanted_inodes is None:
+        return None
+
+    port_pids = {port: [] for port in ports}
+    if not wanted_inodes:
+        return port_pids
+
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        fd_dir = os.path.join(entry.path, "fd")
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd))
+            except OSError:
+                continue
+            port = wanted_inodes.get(target)
+            if port is not None and int(entry.name) not in port_pids[port]:
+                port_pids[port].append(int(entry.name))
+
+    return port_pids
+
+
+def _pids_listening_via_lsof(ports):
+    """
+    Maps each port to its listening PIDs with a single lsof call for all ports.
+    -F pn emits field-prefixed lines (p<pid>, n<addr>:<port>) so PIDs can be
+    attributed to ports in one pass.
+    """
+    args = ["lsof", "-nP", "-l", "-sTCP:LISTEN", "-F", "pn"]
     for port in ports:
+        args += ["-i", f"tcp:{port}"]
+
+    # lsof exits non-zero when nothing matches, which is the common case
+    result = subprocess.run(args, capture_output=True)
+
+    port_pids = {port: [] for port in ports}
+    current_pid = None
+    # Parse the raw bytes: int() accepts ASCII digits in bytes, so no decode pass
+    for line in result.stdout.splitlines():
+        if line.startswith(b"p"):
+            current_pid = int(line[1:])
+        elif line.startswith(b"n") and current_pid is not None:
+            try:
+                port = int(line.rsplit(b":", 1)[1])
+            except (IndexError, ValueError):
+                continue
+            if port in port_pids and current_pid not in port_pids[port]:
+                port_pids[port].append(current_pid)
+    return port_pids
+
+
+def _find_port_pids(ports):
+    """Maps each port to its listening PIDs, preferring /proc over lsof."""
+    port_pids = None if IS_MAC else _pids_listening_on_linux(ports)
+    if port_pids is None:
+        port_pids = _pids_listening_via_lsof(ports)
+    return port_pids
+
+
+def _ports_in_use(ports):
+    """Returns the subset of ports that still have a listening socket."""
+    sockets = None if IS_MAC else _listening_sockets_linux(ports)
+    if sockets is not None:
+        return set(sockets.values())
+    return {port for port, pids in _pids_listening_via_lsof(ports).items() if pids}
+
+
+def _wait_port_free(ports, timeout=0.5, interval=0.02):
+    """Polls until none of the ports are listening. Returns True if they cleared."""
+    deadline = time.monotonic() + timeout
+    while _ports_in_use(ports):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+
+def _port_is_free(port):
+    """Cheap bind probe: True only if nothing holds the port on any IPv4 address."""
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 0)
+        s.bind(("", port))
+        return True
+    except OSError:
+        # EADDRINUSE (or anything unexpected): let the real lookup decide
+        return False
+    finally:
+        s.close()
+
+
+def kill_port_processes(ports):
+    """
+    Stops any process running on the specified ports. Sends SIGTERM first so
+    servers can close their sockets, and escalates to SIGKILL only if the port
+    is still held after a short grace period.
+    """
+    # Skip the lookup entirely for ports nobody is bound to (the common case)
+    ports = {port for port in ports if not _port_is_free(port)}
+    if not ports:
+        return
+
+    try:
+        port_pids = _find_port_pids(ports)
+    except Exception as e:
+        print(f"Error looking up processes on ports {sorted(ports)}: {e}")
+        return
+
+    pids = set()
+    for port, port_pid_list in port_pids.items():
+        for pid in port_pid_list:
+            print(f"⚠️ Port {port} is in use by PID {pid}. Terminating...")
+            pids.add(pid)
+
+    if not pids:
+        return
+
+    for pid in pids:
         try:
-            # Using lsof to find PIDs on the port
-            # -ti returns just the PIDs
-            result = subprocess.check_output(
-                ["lsof", "-ti", f":{port}", "-sTCP:LISTEN"], stderr=subprocess.DEVNULL
-            )
-            pids = result.decode().strip().split("\n")
-            for pid in pids:
-                if pid:
-                    print(f"⚠️ Port {port} is in use by PID {pid}. Terminating...")
-                    try:
-                        os.kill(int(pid), signal.SIGKILL)
-                    except ProcessLookupError:
-                        pass
-        except subprocess.CalledProcessError:
-            # No process found on this port, which is good
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
             pass
-        except Exception as e:
-            print(f"Error killing process on port {port}: {e}")
+
+    try:
+        if _wait_port_free(ports, timeout=0.2):
+            return
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        _wait_port_free(ports)
+    except Exception as e:
+        print(f"Error killing processes on ports {sorted(ports)}: {e}")
 
 
 def cleanup_temp_dir():
     """Removes temporary directory and contents."""
     if os.path.exists(TEMP_DIR):
         try:
-            shutil.rmtree(TEMP_DIR)
+            fast_rmtree(TEMP_DIR)
         except Exception as e:
             print(f"Cleanup Warning: {e}")
 
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip():
-    """Attempts to retrieve the local LAN IP address."""
+    """Attempts to retrieve the local LAN IP address (cached for the process)."""
+    s = None
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         # Doesn't need to be reachable
         s.connect(("10.255.255.255", 1))
         IP = s.getsockname()[0]
     except Exception:
-        IP = "127.0.0.1"
+        IP = _local_ip_from_hostname()
     finally:
-        s.close()
+        if s is not None:
+            s.close()
     return IP
 
 
+def _local_ip_from_hostname():
+    """Fallback: first non-loopback IPv4 address the hostname resolves to."""
+    try:
+        for info in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET):
+            ip = info[4][0]
+            if not ip.startswith("127."):
+                return ip
+    except OSError:
+        pass
+    return "127.0.0.1"
+
+
+def _frontend_source_hash():
+    """Hashes the paths, sizes and mtimes of the frontend sources (not contents)."""
+    digest = hashlib.blake2b(digest_size=16)
+
+    def walk(path):
+        try:
+            entries = sorted(os.scandir(path), key=lambda e: e.name)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                walk(entry.path)
+            else:
+                st = entry.stat(follow_symlinks=False)
+                digest.update(
+                    f"{os.path.relpath(entry.path, FRONTEND_DIR)}|{st.st_size}|{st.st_mtime_ns}\n".encode()
+                )
+
+    for name in FRONTEND_SOURCES:
+        path = os.path.join(FRONTEND_DIR, name)
+        if os.path.isdir(path):
+            walk(path)
+        elif os.path.exists(path):
+            st = os.stat(path)
+            digest.update(f"{name}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _watch_build(process, source_hash):
+    """Waits for a background frontend build and records its stamp on success."""
+    returncode = process.wait()
+    if returncode == 0:
+        try:
+            with open(FRONTEND_BUILD_STAMP, "w") as f:
+                f.write(source_hash)
+        except OSError as e:
+            print(f"Warning: Could not write frontend build stamp: {e}")
+        print("✅ Frontend build completed successfully.")
+    elif returncode > 0:
+        print(f"❌ Error building frontend (exit code {returncode}).")
+        print("Continuing with potential missing frontend...")
+
+
 def check_static_build():
-    """Checks if static build exists. If not, builds it."""
+    """
+    Checks if the static build is up to date with the frontend sources.
+    If not, starts the build in the background and returns its process so the
+    backend can boot in parallel (the SPA route serves the output once ready).
+    """
     print("--------------------------------------------------")
     print("📦 Checking Frontend Build...")
 
+    source_hash = _frontend_source_hash()
     index_path = os.path.join(WEB_APP_OUT_DIR, "index.html")
-    if os.path.exists(WEB_APP_OUT_DIR) and os.path.exists(index_path):
-        print(f"✅ Static build found at: {WEB_APP_OUT_DIR}")
-        print("   Skipping build step.")
-        return
-
-    print("⚠️ Static build NOT found. Building now...")
+    if os.path.exists(index_path):
+        try:
+            with open(FRONTEND_BUILD_STAMP, "r") as f:
+                if f.read().strip() == source_hash:
+                    print(f"✅ Static build found at: {WEB_APP_OUT_DIR}")
+                    print("   Sources unchanged. Skipping build step.")
+                    return None
+        except OSError:
+            pass
+        print("⚠️ Static build is stale. Rebuilding in the background...")
+    else:
+        print("⚠️ Static build NOT found. Building in the background...")
     print(f"   Running: {' '.join(FRONTEND_BUILD_COMMAND)}")
     print("--------------------------------------------------")
 
     try:
-        # Run synchronous build
-        subprocess.check_call(
-            FRONTEND_BUILD_COMMAND,
-            cwd=FRONTEND_DIR,
-        )
-        print("✅ Frontend build completed successfully.")
+        process = subprocess.Popen(FRONTEND_BUILD_COMMAND, cwd=FRONTEND_DIR)
     except FileNotFoundError:
         print(f"Error: Command '{FRONTEND_BUILD_COMMAND[0]}' not found.")
         print("Please ensure Bun is installed and available in your PATH.")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error building frontend: {e}")
-        print("Continuing with potential missing frontend...")
+        return None
     except Exception as e:
         print(f"Error during frontend build: {e}")
+        return None
+
+    threading.Thread(
+        target=_watch_build, args=(process, source_hash), daemon=True
+    ).start()
+    return process
 
 
 def run_dev_server():
@@ -144,6 +387,36 @@ def run_dev_server():
         print(f"Error running dev server: {e}")
 
 
+def _watch_stdin_for_stop(server_instance):
+    """
+    Registers a stdin reader on the server's event loop that stops uvicorn when
+    the user types 's' + Enter, instead of blocking a thread on input().
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, ValueError, OSError):
+        return
+
+    def on_stdin():
+        line = sys.stdin.readline()
+        if not line:
+            # EOF (stdin closed/detached): stop watching, keep serving
+            loop.remove_reader(fd)
+            return
+        if line.strip().lower() == "s":
+            print("\n" + "=" * 50)
+            print("🛑 Stopping all services...")
+            print("=" * 50)
+            server_instance.should_exit = True
+
+    try:
+        loop.add_reader(fd, on_stdin)
+    except (NotImplementedError, ValueError, OSError):
+        # e.g. the Windows proactor loop has no add_reader; use Ctrl+C instead
+        pass
+
+
 # --- MAIN ENTRY POINT ---
 
 
@@ -158,111 +431,100 @@ def run_web_ui(headless: bool = False, dev_mode: bool = False):
     print("=" * 50)
 
     frontend_process = None
+    build_process = None
 
     # 1. Frontend Setup
     if dev_mode:
         # Kill both ports to be clean
         kill_port_processes([8008, 3031])
-        time.sleep(1)
         cleanup_temp_dir()
 
         # Start Dev Server in separate process
-        frontend_process = multiprocessing.Process(target=run_dev_server, daemon=True)
+        frontend_process = MP_CONTEXT.Process(target=run_dev_server, daemon=True)
         frontend_process.start()
     else:
         # Kill only backend port (8008), leave 3031 alone or kill it?
         # Safest to kill 8008. User didn't ask to explicitly kill 3031 in prod, but "remove that next js ports" suggests they don't want interference.
         kill_port_processes([8008])
-        time.sleep(1)
         cleanup_temp_dir()
 
-        # Check/Build Static Frontend (Synchronous)
-        check_static_build()
-
-    # No separate process needed for frontend since we serve it statically
-    # frontend_process = multiprocessing.Process(target=run_frontend, daemon=True)
-    # frontend_process.start()
-
-    # 3. Start the Telegram Bot in a separate PROCESS
-    bot_process = multiprocessing.Process(target=start_bot, daemon=True)
-    bot_process.start()
-
-    # Give services a moment to start
-    time.sleep(2)
+        # Check/Build Static Frontend (in the background if a rebuild is needed)
+        build_process = check_static_build()
 
-    # 4. Start the Backend in a separate thread so we can listen for keyboard input
+    # 4. Run the Backend on the main thread (uvicorn handles Ctrl+C there)
     print("\n" + "-" * 50)
     print("📦 Starting FastAPI Backend...")
     print(f"Backend API URL: {BACKEND_URL}")
     print(f"Network URL: http://{get_local_ip()}:8008")
     print("-" * 50)
     print("\n" + "=" * 50)
-    print("💡 Press 's' + Enter to stop all services")
+    if headless:
+        print(
+            "Headless mode enabled. Running indefinitely. Press Ctrl+C to stop or kill the process."
+        )
+    else:
+        print("💡 Press 's' + Enter to stop all services")
     print("=" * 50 + "\n")
 
-    import threading
+    import uvicorn
+
+    # uvloop/httptools come with uvicorn[standard]; fall back to asyncio/h11
+    config = uvicorn.Config(
+        server.app,
+        host="0.0.0.0",
+        port=8008,
+        log_level="warning",
+        lifespan="on",
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        access_log=False,
+    )
+    server_instance = uvicorn.Server(config)
+
+    if not headless:
+        server.app.add_event_handler(
+            "startup", lambda: _watch_stdin_for_stop(server_instance)
+        )
 
-    def run_server_thread():
-        """Run the uvicorn server in a thread."""
-        import uvicorn
-        from fastapi.middleware.cors import CORSMiddleware
+    # 3. Run the Telegram Bot as a task on the server's event loop
+    bot_tasks = []
 
-        # Add CORS middleware
-        server.app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
+    async def run_bot():
+        try:
+            await start_bot_async()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error in Telegram bot: {e}")
 
-        config = uvicorn.Config(server.app, host="0.0.0.0", port=8008, log_level="warning")
-        server_instance = uvicorn.Server(config)
+    server.app.add_event_handler(
+        "startup", lambda: bot_tasks.append(asyncio.create_task(run_bot()))
+    )
 
-        # Store server reference for shutdown
-        run_server_thread.server = server_instance
-        server_instance.run()
+    async def stop_bot():
+        for task in bot_tasks:
+            task.cancel()
+        await asyncio.gather(*bot_tasks, return_exceptions=True)
 
-    # Start server in a thread
-    server_thread = threading.Thread(target=run_server_thread, daemon=True)
-    server_thread.start()
+    server.app.add_event_handler("shutdown", stop_bot)
 
-    # Listen for keyboard input to stop
     try:
-        if headless:
-            print(
-                "Headless mode enabled. Running indefinitely. Press Ctrl+C to stop or kill the process."
-            )
-            # In headless mode, we just wait for a signal.
-            # signal.pause() is efficient but only works on Unix.
-            # A simple loop is more portable if needed, but we're on Linux.
-            while True:
-                time.sleep(1)
-        else:
-            while True:
-                user_input = input().strip().lower()
-                if user_input == "s":
-                    print("\n" + "=" * 50)
-                    print("🛑 Stopping all services...")
-                    print("=" * 50)
-                    break
-    except (KeyboardInterrupt, EOFError):
+        server_instance.run()
+    except KeyboardInterrupt:
         print("\n🛑 Interrupt received, stopping...")
 
     # Shutdown sequence
-    print("   ↳ Stopping FastAPI server...")
-    if hasattr(run_server_thread, "server"):
-        run_server_thread.server.should_exit = True
-
-    print("   ↳ Stopping Telegram bot...")
-    if bot_process.is_alive():
-        bot_process.terminate()
-        bot_process.join(timeout=2)
-
     print("   ↳ Stopping Frontend...")
     if frontend_process and frontend_process.is_alive():
         frontend_process.terminate()
         frontend_process.join(timeout=2)
+    if build_process and build_process.poll() is None:
+        build_process.terminate()
+        try:
+            build_process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            build_process.kill()
+            build_process.wait()
 
     # Kill any remaining processes on ports
     kill_port_processes([8008, 3031])
@@ -273,8 +535,6 @@ def run_web_ui(headless: bool = False, dev_mode: bool = False):
 
 
 if __name__ == "__main__":
-    import sys
-
     headless = "--headless" in sys.argv
     dev = "--dev" in sys.argv
     multiprocessing.freeze_support()
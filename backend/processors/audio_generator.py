@@ -1,23 +1,38 @@
 # processors/audio_generator.py
 
+import functools
 import hashlib
+import heapq
+import importlib
 import json
 import os
+import random
 import re
 import shutil
+import sys
+import threading
 import time
+from collections import namedtuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from math import gcd
 
-import whisper_timestamped as whisper
-from moviepy.editor import AudioFileClip, concatenate_audioclips
+import numpy as np
+import soundfile as sf
+from faster_whisper import WhisperModel
+from moviepy.audio.AudioClip import AudioArrayClip
+from scipy.signal import resample_poly
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
-# Import necessary components from config
 # Import necessary components from config
 try:
     from ..config import (
         AUDIO_CACHE_DIR,
         CHARACTER_MAP,
-        DEFAULT_TTS_PROCESSES,
         GEMINI_TTS_WAIT_SECONDS,
         IS_MAC,
         MIN_CLIP_DURATION,
@@ -25,14 +40,15 @@ try:
         TEMP_MP3_PATH,
         TEMP_WAV_PATH,
         TTS_PROCESS_CONFIG,
-        WHISPER_DEVICE,
-        suppress_output,
+        TTS_REQUESTS_PER_MINUTE,
+        get_tts_executor,
+        get_whisper_device,
+        load_json_file,
     )
 except ImportError:
     from config import (
         AUDIO_CACHE_DIR,
         CHARACTER_MAP,
-        DEFAULT_TTS_PROCESSES,
         GEMINI_TTS_WAIT_SECONDS,
         IS_MAC,
         MIN_CLIP_DURATION,
@@ -40,113 +56,103 @@ except ImportError:
         TEMP_MP3_PATH,
         TEMP_WAV_PATH,
         TTS_PROCESS_CONFIG,
-        WHISPER_DEVICE,
-        suppress_output,
+        TTS_REQUESTS_PER_MINUTE,
+        get_tts_executor,
+        get_whisper_device,
+        load_json_file,
     )
 
 
+# Whisper decodes audio in 30s windows; batching turns up to that length keeps
+# its fixed per-call cost amortized while still transcribing during TTS
+WHISPER_WINDOW_SECONDS = 30.0
+MAX_WHISPER_CPU_WORKERS = 4
+WHISPER_SAMPLE_RATE = 16000  # faster-whisper takes 16 kHz mono float32
+WHISPER_MODEL_NAME = "tiny"
+
+# --- PRECOMPILED PATTERNS ---
+# [emotion/direction] tags; [^\]\n]* avoids .*? backtracking past the closing bracket
+_BRACKET_RE = re.compile(r"\[[^\]\n]*\]")
+# Kokoro has no emotion tags, so map the common ones to punctuation-based cues
+_KOKORO_TAG_SUBS = tuple(
+    (re.compile(pattern, re.IGNORECASE), replacement)
+    for pattern, replacement in (
+        (r"\[disbelief\]", "...?"),
+        (r"\[(?:confused|questioning)\]", "?"),
+        (r"\[(?:pause|thoughtful|hesitation)\]", "..."),
+        (r"\[(?:excited|surprised|shouting|happy)\]", "!!"),
+        (r"\[(?:interrupted|cutting off)\]", "—"),
+        (r"\[(?:serious|stern|angry)\]", "."),
+    )
+)
+# ASCII digits only, so non-Latin scripts are left untouched
+_DIGIT_COMMA_RE = re.compile(r"(?<=[0-9]),(?=[0-9])")
+_DIGIT_POINT_RE = re.compile(r"(?<=[0-9])\.(?=[0-9])")
+# At least one word character (Unicode-aware — supports Devanagari, CJK, etc.)
+# Bound method, so the per-word check skips the attribute lookup
+_has_word_char = re.compile(r"\w").search
+
 # --- CONFIGURATION FOR RETRY ---
 MAX_GEMINI_RETRIES = 6
-DEFAULT_RATE_LIMIT_WAIT = 60
+RATE_LIMIT_BACKOFF_BASE = 10  # seconds; doubles per attempt, with jitter
+RATE_LIMIT_BACKOFF_CAP = 120
 GEMINI_API_NO_AUDIO_DATA = "no audio data"
+# "No audio data" is usually a one-off glitch: retry almost at once and back
+# off quickly, capped at GEMINI_TTS_WAIT_SECONDS
+NO_AUDIO_RETRY_BASE = 0.1
+# Gemini reports the server-suggested delay as RetryInfo "retryDelay": "37s"
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s")
+
+# When any worker hits a rate limit, every worker on that service waits it out
+# together instead of each one sleeping and then retrying in a herd.
+_SERVICE_PAUSED_UNTIL = {}
+_SERVICE_PAUSE_LOCK = threading.Lock()
+
+# --- TTS SERVICES ---
+GEMINI_RATE_LIMIT_ERROR_CODE = "429 RESOURCE_EXHAUSTED"
+
+# mode -> (service module, temp file template, audio extension). Modules are
+# imported on first use, so a reel only loads the SDK of the mode it runs.
+_TTS_SERVICES = {
+    "gemini": ("gemini_tts", TEMP_WAV_PATH, ".wav"),
+    "elevenlabs": ("elevenlabs_tts", TEMP_MP3_PATH, ".mp3"),
+    "mac_say": ("mac_say_tts", TEMP_AIFF_PATH, ".aiff"),
+    "kokoro": ("kokoro_tts", TEMP_WAV_PATH, ".wav"),
+    "kokoro_mlx": ("kokoro_mlx_tts", TEMP_WAV_PATH, ".wav"),
+}
 
-# Import the services (assuming these are correct and handle the voice_id passed)
-try:
-    try:
-        from ..services import elevenlabs_tts
-    except ImportError:
-        import services.elevenlabs_tts as elevenlabs_tts
-except ImportError:
-
-    class ElevenLabsServiceStub:
-        def is_service_available(self):
-            return False
-
-        def generate_audio(self, *args, **kwargs):
-            raise NotImplementedError("ElevenLabs service not implemented.")
 
-    elevenlabs_tts = ElevenLabsServiceStub()
+class _ServiceStub:
+    """Stands in for a TTS service that cannot be imported on this machine."""
 
+    def __init__(self, name):
+        self.name = name
 
-class GeminiServiceStub:
     def is_service_available(self):
         return False
 
     def generate_audio(self, *args, **kwargs):
-        raise NotImplementedError("Gemini service not implemented.")
-
-
-try:
-    try:
-        from ..services import gemini_tts
-
-        GEMINI_RATE_LIMIT_ERROR_CODE = "429 RESOURCE_EXHAUSTED"
-    except ImportError as e1:
-        try:
-            import services.gemini_tts as gemini_tts
+        raise NotImplementedError(f"{self.name} service not available.")
 
-            GEMINI_RATE_LIMIT_ERROR_CODE = "429 RESOURCE_EXHAUSTED"
-        except ImportError as e2:
-            # print(f"DEBUG: Failed to import gemini_tts: {e1} | {e2}")
-            gemini_tts = GeminiServiceStub()
-except Exception as e:
-    # print(f"DEBUG: Unexpected error importing gemini_tts: {e}")
-    if "gemini_tts" not in locals():
-        gemini_tts = GeminiServiceStub()
+    generate_audio_mlx = generate_audio
 
 
-try:
-    if IS_MAC:
+@functools.lru_cache(maxsize=None)
+def _get_service(effective_mode):
+    """Imports the service module for a TTS mode, or returns a stub."""
+    module_name = _TTS_SERVICES[effective_mode][0]
+    if effective_mode == "mac_say" and not IS_MAC:
+        return _ServiceStub(module_name)
+    for name, package in (
+        (f"..services.{module_name}", __package__),
+        (f"services.{module_name}", None),
+    ):
         try:
-            from ..services import mac_say_tts
-        except ImportError:
-            import services.mac_say_tts as mac_say_tts
-    else:
-        raise ImportError("Not on macOS")
-except ImportError:
-
-    class MacSayServiceStub:
-        def is_service_available(self):
-            return False
-
-        def generate_audio(self, *args, **kwargs):
-            raise NotImplementedError("MacSay service not available on this platform.")
-
-    mac_say_tts = MacSayServiceStub()
-
-
-try:
-    try:
-        from ..services import kokoro_tts
-    except ImportError:
-        import services.kokoro_tts as kokoro_tts
-except ImportError:
-
-    class KokoroServiceStub:
-        def is_service_available(self):
-            return False
-
-        def generate_audio(self, *args, **kwargs):
-            raise NotImplementedError("Kokoro service not implemented.")
-
-    kokoro_tts = KokoroServiceStub()
-
-
-try:
-    try:
-        from ..services import kokoro_mlx_tts
-    except ImportError:
-        import services.kokoro_mlx_tts as kokoro_mlx_tts
-except ImportError:
-
-    class KokoroMLXServiceStub:
-        def is_service_available(self):
-            return False
-
-        def generate_audio_mlx(self, *args, **kwargs):
-            raise NotImplementedError("Kokoro MLX service not implemented.")
-
-    kokoro_mlx_tts = KokoroMLXServiceStub()
+            return importlib.import_module(name, package)
+        except (ImportError, TypeError):
+            # TypeError: relative import without a parent package
+            continue
+    return _ServiceStub(module_name)
 
 
 # --- VOICE ID LOOKUP UTILITY ---
@@ -192,11 +198,24 @@ def _auto_map_voice(original_voice: str, language_code: str) -> str | None:
     return None
 
 
+_MODE_TO_KEY = {
+    "gemini": "voice_gemini",
+    "elevenlabs": "voice_eleven",
+    "mac_say": "voice_mac",
+    "kokoro": "voice_kokoro",
+    "kokoro_mlx": "voice_kokoro_mlx",
+}
+
+
+@functools.lru_cache(maxsize=256)
 def get_voice_id_for_role(role, tts_mode, language_code=None):
     """
     Retrieves the specific voice ID for a character and TTS mode from CHARACTER_MAP.
     Falls back to case-insensitive matching if exact match fails.
     If language_code is set, auto-selects a language-appropriate voice.
+
+    Results are memoized; call get_voice_id_for_role.cache_clear() after
+    CHARACTER_MAP changes.
     """
     config = CHARACTER_MAP.get(role)
     if config is None:
@@ -212,17 +231,11 @@ def get_voice_id_for_role(role, tts_mode, language_code=None):
         )
 
     effective_mode = "gemini" if tts_mode == "default" else tts_mode
+    voice_key = _MODE_TO_KEY.get(effective_mode)
+    if voice_key is None:
+        return None
 
-    if effective_mode == "gemini":
-        voice_key = "voice_gemini"
-    elif effective_mode == "elevenlabs":
-        voice_key = "voice_eleven"
-    elif effective_mode == "mac_say":
-        voice_key = "voice_mac"
-    elif effective_mode == "kokoro":
-        voice_key = "voice_kokoro"
-    elif effective_mode == "kokoro_mlx":
-        voice_key = "voice_kokoro_mlx"
+    if effective_mode == "kokoro_mlx":
         voice_id = config.get(voice_key) or config.get("voice_kokoro")
         # For non-English languages, auto-map to a language-appropriate voice
         if voice_id and language_code and language_code != "en":
@@ -230,19 +243,296 @@ def get_voice_id_for_role(role, tts_mode, language_code=None):
             if mapped:
                 return mapped
         return voice_id
-    else:
-        return None
 
     return config.get(voice_key)
 
 
-# --- AUDIO GENERATION CORE LOGIC ---
+# --- TTS AUDIO CACHE ---
+
+
+def _cache_lookup(effective_mode, voice_id, text, ext, language_code):
+    """
+    Returns the content-addressed cache path for a synthesized turn.
+    Files are sharded as AUDIO_CACHE_DIR/<mode>/<hash[:2]>/<hash><ext>;
+    the shard directories come from _ensure_cache_dirs().
+    """
+    # The key only names cache entries, so a fast non-cryptographic 128-bit
+    # hash (XXH3) is enough; blake2b is the stdlib fallback. Fields are fed
+    # separately (NUL-delimited) so no joined key string is built per turn.
+    h = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    for part in (effective_mode, voice_id, language_code or ""):
+        h.update(part.encode())
+        h.update(b"\x00")
+    h.update(text.encode())
+    text_hash = h.hexdigest()
+    return os.path.join(
+        AUDIO_CACHE_DIR, effective_mode, text_hash[:2], f"{text_hash}{ext}"
+    )
+
+
+_CACHE_DIRS_READY = set()
+
+
+def _ensure_cache_dirs(effective_mode):
+    """
+    Creates every shard directory for a mode once per process, before TTS is
+    dispatched, so workers never call makedirs on a cache hit.
+    """
+    if effective_mode in _CACHE_DIRS_READY:
+        return
+    mode_dir = os.path.join(AUDIO_CACHE_DIR, effective_mode)
+    for shard in range(256):
+        os.makedirs(os.path.join(mode_dir, f"{shard:02x}"), exist_ok=True)
+    _CACHE_DIRS_READY.add(effective_mode)
+
+
+def _word_timings_path(cache_path, source="words"):
+    return f"{os.path.splitext(cache_path)[0]}.{source}.json"
+
+
+def _whisper_timings_source():
+    """Sidecar name for Whisper timings, so a model change misses."""
+    return f"whisper-ct2-{WHISPER_MODEL_NAME}"
+
+
+def _load_cached_word_timings(cache_path, source="words"):
+    """Returns the turn-relative word timings stored next to a cached clip, if any."""
+    try:
+        # An empty list is treated as a miss so the turn gets transcribed again
+        return load_json_file(_word_timings_path(cache_path, source)) or None
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _save_cached_word_timings(cache_path, word_timings, source="words"):
+    with open(_word_timings_path(cache_path, source), "w", encoding="utf-8") as f:
+        json.dump(word_timings, f)
+
+
+def _cache_whisper_timings(cache_path, words, shift):
+    """Stores a turn's Whisper words, moved from window-relative to turn-relative."""
+    if not words:
+        # Nothing recognized (e.g. VAD filtered the turn out): retry next time
+        return
+    turn_words = [
+        dict(word, start=word["start"] - shift, end=word["end"] - shift)
+        for word in words
+    ]
+    try:
+        _save_cached_word_timings(cache_path, turn_words, _whisper_timings_source())
+    except OSError as e:
+        print(f"Warning: Failed to cache word timings: {e}")
+
+
+def _unlink_quiet(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+# --- WORD TIMING DATA ---
+
+
+class WordData(namedtuple("WordData", "starts ends words roles")):
+    """
+    Word timings as parallel columns: float64 numpy arrays for starts/ends and
+    plain lists for the word text and speaking role.
+    """
+
+    __slots__ = ()
+
+    def to_dicts(self):
+        """Returns the words as a list of {"word", "start", "end", "role"} dicts."""
+        return [
+            {"word": word, "start": start, "end": end, "role": role}
+            for word, start, end, role in zip(
+                self.words, self.starts.tolist(), self.ends.tolist(), self.roles
+            )
+        ]
+
+
+# --- WHISPER HELPERS ---
+
+
+def _whisper_workers():
+    """Number of windows to transcribe concurrently on the shared model."""
+    if get_whisper_device() == "cuda":
+        return 2
+    # Each CTranslate2 worker holds its own model replica; past a few workers
+    # the extra memory buys less than giving each one more intra-op threads
+    return max(1, min(MAX_WHISPER_CPU_WORKERS, (os.cpu_count() or 2) // 2))
+
+
+_WHISPER_MODEL = None
+_WHISPER_MODEL_LOCK = threading.Lock()
+
+
+def _get_whisper_model():
+    """Returns the process-wide Whisper model, loading it on first use."""
+    global _WHISPER_MODEL
+    if _WHISPER_MODEL is None:
+        with _WHISPER_MODEL_LOCK:
+            if _WHISPER_MODEL is None:
+                _WHISPER_MODEL = _load_whisper_model()
+    return _WHISPER_MODEL
+
+
+def _load_whisper_model():
+    """
+    Loads the faster-whisper (CTranslate2) model named by WHISPER_MODEL_NAME:
+    FP16 on CUDA, INT8 on the CPU.
+    """
+    # CTranslate2 has no MPS backend; INT8 on the CPU is the fast path on Mac.
+    # On CUDA plain FP16 beats INT8 for a model this small (no dequant step).
+    device = "cuda" if get_whisper_device() == "cuda" else "cpu"
+    compute_type = "float16" if device == "cuda" else "int8"
+    workers = _whisper_workers()
+    return WhisperModel(
+        WHISPER_MODEL_NAME,
+        device=device,
+        compute_type=compute_type,
+        num_workers=workers,
+        cpu_threads=max(1, (os.cpu_count() or 2) // workers),
+    )
+
+
+def _transcribe_words(model, audio, language):
+    """Transcribes audio and returns a flat list of {"text", "start", "end"} words."""
+    segments, _ = model.transcribe(
+        audio, language=language, word_timestamps=True, vad_filter=True
+    )
+    return [
+        {"text": w.word.strip(), "start": w.start, "end": w.end}
+        for segment in segments
+        for w in segment.words or ()
+    ]
+
+
+# --- RATE LIMIT BACKOFF ---
+
+
+def _parse_retry_after(value):
+    """Parses a Retry-After value: delay in seconds or an HTTP date."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _parse_rate_limit_reset(value):
+    """X-RateLimit-Reset is either seconds to wait or an epoch timestamp."""
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    if reset > 1_000_000_000:  # epoch seconds
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+def _retry_after_seconds(error):
+    """Returns the server-requested retry delay carried by an error, if any."""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return _parse_retry_after(retry_after)
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is not None:
+        if headers.get("Retry-After") is not None:
+            return _parse_retry_after(headers.get("Retry-After"))
+        if headers.get("X-RateLimit-Reset") is not None:
+            return _parse_rate_limit_reset(headers.get("X-RateLimit-Reset"))
+    match = _RETRY_DELAY_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+def _rate_limit_backoff(attempt, error):
+    """Retry-After when given, else capped exponential backoff with jitter."""
+    retry_after = _retry_after_seconds(error)
+    if retry_after is not None:
+        return retry_after
+    backoff = min(RATE_LIMIT_BACKOFF_CAP, RATE_LIMIT_BACKOFF_BASE * (2**attempt))
+    return backoff * (0.5 + random.random())
+
+
+def _no_audio_backoff(attempt):
+    """Fast exponential backoff with jitter for empty Gemini responses."""
+    backoff = min(GEMINI_TTS_WAIT_SECONDS, NO_AUDIO_RETRY_BASE * (2**attempt))
+    return backoff * (1 + 0.3 * random.random())
+
+
+def _pause_service(effective_mode, seconds):
+    with _SERVICE_PAUSE_LOCK:
+        resume_at = time.monotonic() + seconds
+        if resume_at > _SERVICE_PAUSED_UNTIL.get(effective_mode, 0.0):
+            _SERVICE_PAUSED_UNTIL[effective_mode] = resume_at
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens per second up to
+    `capacity`. A caller that finds it empty reserves the next token (the
+    count goes negative) and sleeps until it is due, so waiters are served
+    in arrival order.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def drain(self):
+        """Drops any saved-up burst, e.g. after the server answered 429."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+
+# One bucket per throttled service, shared by all of its TTS workers; the
+# burst lets each worker start immediately
+_RATE_LIMITERS = {
+    mode: _TokenBucket(rpm / 60.0, max(1, TTS_PROCESS_CONFIG.get(mode, 1)))
+    for mode, rpm in TTS_REQUESTS_PER_MINUTE.items()
+    if rpm > 0
+}
+
+
+def _wait_for_service(effective_mode):
+    """Blocks while the service is paused after a rate limit."""
+    while True:
+        with _SERVICE_PAUSE_LOCK:
+            resume_at = _SERVICE_PAUSED_UNTIL.get(effective_mode, 0.0)
+        remaining = resume_at - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(remaining)
 
 
 # --- AUDIO GENERATION CORE LOGIC ---
 
 
-def _generate_tts_only(turn_index, turn, tts_mode, language_code="en", reel_name=None):
+def _generate_tts_only(turn_index, turn, tts_mode, language_code="en"):
     """
     Generates audio file for a single turn and returns the path.
     """
@@ -253,37 +543,20 @@ def _generate_tts_only(turn_index, turn, tts_mode, language_code="en", reel_name
 
     # Enhance Kokoro output by mapping emotion tags to punctuation
     if effective_mode == "kokoro":
-        # Mapping common emotion tags to punctuation-based cues
-        text = re.sub(r"\[disbelief\]", "...?", text, flags=re.IGNORECASE)
-        text = re.sub(r"\[(?:confused|questioning)\]", "?", text, flags=re.IGNORECASE)
-        text = re.sub(
-            r"\[(?:pause|thoughtful|hesitation)\]", "...", text, flags=re.IGNORECASE
-        )
-        text = re.sub(
-            r"\[(?:excited|surprised|shouting|happy)\]", "!!", text, flags=re.IGNORECASE
-        )
-        text = re.sub(
-            r"\[(?:interrupted|cutting off)\]", "—", text, flags=re.IGNORECASE
-        )
-        text = re.sub(r"\[(?:serious|stern|angry)\]", ".", text, flags=re.IGNORECASE)
-        # Strip any remaining unknown [emotion] tags
-        text = re.sub(r"\[.*?\]", "", text).strip()
-
-        # Normalize numbers for Kokoro: ASCII digits only, skip non-Latin scripts
-        text = re.sub(r"(?<=[0-9]),(?=[0-9])", "", text)
-        text = re.sub(r"(?<=[0-9])\.(?=[0-9])", " point ", text)
+        for pattern, replacement in _KOKORO_TAG_SUBS:
+            text = pattern.sub(replacement, text)
 
-    # Apply same normalization for kokoro_mlx
-    if effective_mode == "kokoro_mlx":
-        text = re.sub(r"\[.*?\]", "", text).strip()
-        # Only normalize ASCII digits — don't touch non-English scripts (Devanagari, etc.)
-        text = re.sub(r"(?<=[0-9]),(?=[0-9])", "", text)
-        text = re.sub(r"(?<=[0-9])\.(?=[0-9])", " point ", text)
+    if effective_mode in ("kokoro", "kokoro_mlx"):
+        # Strip any remaining unknown [emotion] tags
+        text = _BRACKET_RE.sub("", text).strip()
+        # Normalize numbers: ASCII digits only — don't touch non-English scripts
+        text = _DIGIT_COMMA_RE.sub("", text)
+        text = _DIGIT_POINT_RE.sub(" point ", text)
 
     # Strip [emotion] tags for mac_say since it doesn't support them
     # and would speak them literally (e.g. "open bracket disbelief close bracket")
     if effective_mode == "mac_say":
-        text = re.sub(r"\[.*?\]", "", text).strip()
+        text = _BRACKET_RE.sub("", text).strip()
 
     voice_id = get_voice_id_for_role(role, tts_mode, language_code=language_code)
 
@@ -293,57 +566,59 @@ def _generate_tts_only(turn_index, turn, tts_mode, language_code="en", reel_name
         )
         return None
 
-    temp_audio_path = None
-    service = None
-
-    if effective_mode == "gemini":
-        service = gemini_tts
-        temp_audio_path = TEMP_WAV_PATH.format(turn_index)
-        ext = ".wav"
-    elif effective_mode == "elevenlabs":
-        service = elevenlabs_tts
-        temp_audio_path = TEMP_MP3_PATH.format(turn_index)
-        ext = ".mp3"
-    elif effective_mode == "mac_say":
-        service = mac_say_tts
-        temp_audio_path = TEMP_AIFF_PATH.format(turn_index)
-        ext = ".aiff"
-    elif effective_mode == "kokoro":
-        service = kokoro_tts
-        temp_audio_path = TEMP_WAV_PATH.format(turn_index)
-        ext = ".wav"
-    elif effective_mode == "kokoro_mlx":
-        service = kokoro_mlx_tts
-        temp_audio_path = TEMP_WAV_PATH.format(turn_index)
-        ext = ".wav"
-    else:
+    if effective_mode not in _TTS_SERVICES:
         return None
+    _, temp_path_template, ext = _TTS_SERVICES[effective_mode]
+    service = _get_service(effective_mode)
+    temp_audio_path = temp_path_template.format(turn_index)
 
     # --- CACHING LOGIC ---
     cache_path = None
-    if reel_name and effective_mode == "gemini":
-        try:
-            # Create a unique hash for the text and voice to avoid collisions
-            text_hash = hashlib.md5(f"{voice_id}_{text}".encode()).hexdigest()
-            cache_subdir = os.path.join(AUDIO_CACHE_DIR, reel_name)
-            os.makedirs(cache_subdir, exist_ok=True)
-            cache_path = os.path.join(
-                cache_subdir, f"turn_{turn_index}_{text_hash}{ext}"
+    try:
+        cache_path = _cache_lookup(effective_mode, voice_id, text, ext, language_code)
+        # A single stat() answers "is it cached?"; a miss raises FileNotFoundError
+        os.stat(cache_path)
+        # Timings from the service, else from an earlier Whisper pass
+        word_timings = _load_cached_word_timings(cache_path)
+        if word_timings is None:
+            word_timings = _load_cached_word_timings(
+                cache_path, _whisper_timings_source()
             )
-
-            if os.path.exists(cache_path):
-                # print(
-                #     f"  > Using cached Gemini audio for turn {turn_index} ({reel_name})"
-                # )
-                shutil.copy2(cache_path, temp_audio_path)
-                return {
-                    "index": turn_index,
-                    "audio_path": temp_audio_path,
-                    "role": role,
-                    "text": text,
-                }
-        except Exception as e:
-            print(f"Warning: Cache check failed: {e}")
+        # Decoded straight from the cache: no temp file is involved at all
+        return {
+            "index": turn_index,
+            "audio_path": cache_path,
+            "role": role,
+            "text": text,
+            "word_timings": word_timings,
+            "cache_path": cache_path,
+        }
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Warning: Cache check failed: {e}")
+
+    # The temp path may still be a hardlink into the cache left by an older
+    # run; drop it so nothing writes through it into the cached file.
+    _unlink_quiet(temp_audio_path)
+
+    # Synthesize straight into the cache (via a per-turn partial file that is
+    # renamed into place), so the result is stored without copying any bytes.
+    # The partial keeps the real extension: some services pick the format from it.
+    if cache_path and not os.path.isdir(os.path.dirname(cache_path)):
+        # The cache was deleted or pruned while running: forget that its
+        # directories exist and recreate them, rather than fail every miss
+        _CACHE_DIRS_READY.discard(effective_mode)
+        try:
+            _ensure_cache_dirs(effective_mode)
+        except OSError as e:
+            print(f"Warning: Could not create audio cache directories: {e}")
+            cache_path = None
+    if cache_path:
+        root = os.path.splitext(cache_path)[0]
+        output_path = f"{root}.{os.getpid()}-{turn_index}.part{ext}"
+    else:
+        output_path = temp_audio_path
 
     # print(
     #     f"  > {effective_mode.upper()} TTS: Generating audio for turn {turn_index} with voice '{voice_id}'."
@@ -355,52 +630,79 @@ def _generate_tts_only(turn_index, turn, tts_mode, language_code="en", reel_name
         )
         return None
 
-    # Retry logic for Gemini TTS rate limits
+    # Retry logic for Gemini TTS rate limits. Each failure kind grows its own
+    # backoff, so a glitch after a few 429s still retries almost at once.
+    rate_limit_hits = 0
+    no_audio_hits = 0
+    rate_limiter = _RATE_LIMITERS.get(effective_mode)
     for attempt in range(MAX_GEMINI_RETRIES):
+        _wait_for_service(effective_mode)
+        if rate_limiter is not None:
+            rate_limiter.acquire()
         try:
             # --- FIX: Added turn_index as a positional argument to generate_audio for all services. ---
             success = False
-            if effective_mode == "kokoro_mlx":
+            word_timings = None
+            if hasattr(service, "generate_audio_with_timestamps"):
+                # Services that report word timings let Phase 2 skip Whisper
+                word_timings = service.generate_audio_with_timestamps(
+                    text, voice_id, output_path, turn_index
+                )
+                success = True
+            elif effective_mode == "kokoro_mlx":
                 if service.generate_audio_mlx(
                     text,
                     voice_id,
-                    temp_audio_path,
+                    output_path,
                     turn_index,
                     language_code=language_code,
                 ):
                     success = True
-            elif service.generate_audio(text, voice_id, temp_audio_path, turn_index):
+            elif service.generate_audio(text, voice_id, output_path, turn_index):
                 success = True
 
             if success:
-                # Save to cache if enabled
+                # Publish into the cache atomically and decode from there
+                audio_path = temp_audio_path
                 if cache_path:
                     try:
-                        shutil.copy2(temp_audio_path, cache_path)
-                    except Exception as e:
+                        if word_timings is not None:
+                            _save_cached_word_timings(cache_path, word_timings)
+                        os.replace(output_path, cache_path)
+                    except OSError as e:
                         print(f"Warning: Failed to save to cache: {e}")
+                        shutil.move(output_path, temp_audio_path)
+                        cache_path = None
+                    else:
+                        audio_path = cache_path
                 # -----------------------------------------------------------------------------------------
                 # print(f"  > {tts_mode.upper()} TTS: Successfully saved audio to {os.path.basename(temp_audio_path)}")
                 return {
                     "index": turn_index,
-                    "audio_path": temp_audio_path,
+                    "audio_path": audio_path,
                     "role": role,
                     "text": text,
+                    "word_timings": word_timings,
+                    "cache_path": cache_path,
                 }
             else:
                 raise Exception(f"{tts_mode.upper()} TTS failed to save file.")
         except Exception as e:
-            if tts_mode == "gemini" and GEMINI_RATE_LIMIT_ERROR_CODE in str(e):
-                wait_time = DEFAULT_RATE_LIMIT_WAIT + attempt * 10
+            if effective_mode == "gemini" and GEMINI_RATE_LIMIT_ERROR_CODE in str(e):
+                wait_time = _rate_limit_backoff(rate_limit_hits, e)
+                rate_limit_hits += 1
                 print(
-                    f"  > Gemini TTS Rate Limit Hit. Waiting {wait_time}s before retrying (Attempt {attempt + 1}/{MAX_GEMINI_RETRIES})..."
+                    f"  > Gemini TTS Rate Limit Hit. Pausing Gemini for {wait_time:.1f}s before retrying (Attempt {attempt + 1}/{MAX_GEMINI_RETRIES})..."
                 )
-                time.sleep(wait_time)
-            elif GEMINI_API_NO_AUDIO_DATA in str(e) and tts_mode == "gemini":
+                _pause_service(effective_mode, wait_time)
+                if rate_limiter is not None:
+                    rate_limiter.drain()
+            elif GEMINI_API_NO_AUDIO_DATA in str(e) and effective_mode == "gemini":
                 print(
                     f"  > Gemini TTS returned no audio data. Retrying with delay (Attempt {attempt + 1}/{MAX_GEMINI_RETRIES})..."
                 )
-                time.sleep(GEMINI_TTS_WAIT_SECONDS)
+                time.sleep(_no_audio_backoff(no_audio_hits))
+                no_audio_hits += 1
             else:
                 # Re-raise if it's a signature mismatch to alert developer
                 if "missing 1 required positional argument: 'turn_index'" in str(e):
@@ -408,209 +710,337 @@ def _generate_tts_only(turn_index, turn, tts_mode, language_code="en", reel_name
                 print(
                     f"Error generating audio for turn {turn_index} with {tts_mode}: {e}"
                 )
+                if cache_path:
+                    _unlink_quiet(output_path)
                 return None
     else:
         print(
             f"Critical Error: Failed to generate audio for turn {turn_index} after {MAX_GEMINI_RETRIES} attempts."
         )
+        if cache_path:
+            _unlink_quiet(output_path)
         return None
 
 
+def _synthesize_turn(turn_index, turn, tts_mode, language_code="en"):
+    """
+    Runs TTS for a turn and decodes the result on the same worker thread, so
+    the samples are ready for Whisper the moment the future completes. Audio
+    not read from the cache came from a per-turn temp file, which is removed
+    once decoded; everything after works on the samples.
+    """
+    result = _generate_tts_only(turn_index, turn, tts_mode, language_code=language_code)
+    if result:
+        try:
+            result["samples"], result["sample_rate"] = _load_turn_audio(
+                result["audio_path"]
+            )
+        except Exception as e:
+            print(f"Error processing audio for turn {turn_index}: {e}")
+            return None
+        finally:
+            if result["audio_path"] != result.get("cache_path"):
+                _unlink_quiet(result["audio_path"])
+    return result
+
+
 def _tokenize_text(text):
     """Strips [emotion/direction] tags from script text and splits into words."""
     # Remove anything in square brackets (e.g., [disbelief], [fast], [sarcastically])
-    cleaned = re.sub(r"\[.*?\]", "", text)
+    cleaned = _BRACKET_RE.sub("", text)
     # Split on whitespace, filter empty strings
     words = [w.strip() for w in cleaned.split() if w.strip()]
     return words
 
 
+def _resample(samples, from_rate, to_rate):
+    """Polyphase resampling of mono float32 samples between integer rates."""
+    if from_rate == to_rate:
+        return samples
+    divisor = gcd(from_rate, to_rate)
+    return resample_poly(samples, to_rate // divisor, from_rate // divisor).astype(
+        np.float32, copy=False
+    )
+
+
+def _load_turn_audio(audio_path):
+    """
+    Decodes a turn's audio once into mono float32 samples (libsndfile, no
+    ffmpeg subprocess). Returns (samples, sample_rate).
+    """
+    samples, sample_rate = sf.read(audio_path, dtype="float32")
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1, dtype=np.float32)
+    return samples, sample_rate
+
+
+def _transcribe_window(whisper_model, turn_samples, sample_rate, language):
+    """
+    Transcribes consecutive turns as one audio window and returns each turn's
+    words, timed relative to the start of the window. The decoded samples are
+    handed to Whisper directly, so it never re-reads the audio through ffmpeg.
+    """
+    turn_ends = np.cumsum([len(samples) for samples in turn_samples]) / sample_rate
+    words_per_turn = [[] for _ in turn_samples]
+    audio = _resample(np.concatenate(turn_samples), sample_rate, WHISPER_SAMPLE_RATE)
+    # No suppress_output here: it silences the whole process, and this runs
+    # while TTS workers are still reporting retries and errors.
+    # faster-whisper logs through `logging` rather than printing.
+    words = _transcribe_words(whisper_model, audio, language)
+
+    # Bucket each recognized word into the turn whose span contains its start,
+    # locating all of them with a single searchsorted call
+    starts = np.fromiter((word["start"] for word in words), float, len(words))
+    turn_positions = np.minimum(
+        np.searchsorted(turn_ends, starts, side="right"), len(turn_samples) - 1
+    )
+    for word, turn_pos in zip(words, turn_positions.tolist()):
+        words_per_turn[turn_pos].append(word)
+    return words_per_turn
+
+
 def generate_multi_role_audio_multiprocess(
-    ordered_turns: list, language_code: str, tts_mode: str, reel_name=None
+    ordered_turns: list, language_code: str, tts_mode: str
 ):
     """
     Optimized generation:
-    1. Parallel TTS Generation (IO Bound) using ThreadPoolExecutor.
-    2. Script-based word timing (uses original text with proportional distribution).
+    1. Parallel TTS Generation (IO Bound) on the shared per-service thread pool.
+    2. Whisper transcription overlapped with TTS: finished turns are
+       transcribed in ~30s windows, in parallel, while later turns are still
+       being synthesized. The model is loaded by the first window, so turns
+       whose service (or the cache) returned word timings skip Whisper entirely.
+    3. Script-based word timing (uses original text with proportional distribution).
     """
     # print(f"\nSelected TTS Mode: {tts_mode.upper()}")
 
+    # Set by the first window job that fails to load the Whisper model
+    whisper_state = {}
+
     # --- PHASE 1: PARALLEL AUDIO GENERATION ---
     start_time = time.time()
 
-    # Determine number of threads based on config
+    # Reuse the persistent worker pool for this service (sized by config)
     effective_mode_for_config = "gemini" if tts_mode == "default" else tts_mode
-    num_threads = TTS_PROCESS_CONFIG.get(
-        effective_mode_for_config, DEFAULT_TTS_PROCESSES
-    )
-
-    if num_threads < 1:
-        num_threads = 1
-
-    # print(f"  > Spawning {num_threads} threads for TTS generation...")
-
-    tts_results = []
-
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        future_to_turn = {
-            executor.submit(
-                _generate_tts_only,
-                i,
-                turn,
-                tts_mode,
-                language_code=language_code,
-                reel_name=reel_name,
-            ): i
-            for i, turn in enumerate(ordered_turns)
-        }
+    executor = get_tts_executor(effective_mode_for_config)
+    try:
+        _ensure_cache_dirs(effective_mode_for_config)
+    except OSError as e:
+        print(f"Warning: Could not create audio cache directories: {e}")
+
+    # Coalesce repeated lines: a turn with the same role and text as an earlier
+    # one reuses that turn's synthesis instead of issuing its own TTS call
+    first_turn_for_line = {}
+    repeats = {}  # first turn index -> later turn indices with the same line
+    future_to_turn = {}
+    for i, turn in enumerate(ordered_turns):
+        line = (turn["role"], turn["text"])
+        first = first_turn_for_line.setdefault(line, i)
+        if first != i:
+            repeats.setdefault(first, []).append(i)
+            continue
+        future = executor.submit(
+            _synthesize_turn,
+            i,
+            turn,
+            tts_mode,
+            language_code=language_code,
+        )
+        future_to_turn[future] = i
 
-        for future in as_completed(future_to_turn):
-            try:
-                result = future.result()
-                if result:
-                    tts_results.append(result)
-            except Exception as e:
-                print(f"Error in TTS thread: {e}")
+    # --- PHASE 2: WHISPER TRANSCRIPTION FOR WORD TIMESTAMPS ---
+    # Use language_code for Whisper (ISO 639-1), fallback to "en"
+    whisper_lang = language_code if language_code else "en"
+
+    turn_samples = []
+    sample_rate = None
+    clip_items = []
+    words_per_turn = []
+    word_offsets = []  # start of each turn's Whisper window on the timeline
+    turn_offsets = []  # start of each turn on the timeline
+    window = []  # positions in turn_samples not yet transcribed
+    window_start = 0.0
+    current_offset = 0.0
 
-    # Sort results by index to ensure processing order
-    tts_results.sort(key=lambda x: x["index"])
+    whisper_pool = ThreadPoolExecutor(max_workers=_whisper_workers())
+    window_jobs = []  # (turn positions, window start, future) per window
 
-    if not tts_results:
-        raise Exception("Failed to generate any audio files.")
+    def _transcribe_job(samples, rate):
+        # The model is loaded (or reused) only once a window actually needs it
+        if "error" in whisper_state:
+            return None
+        try:
+            whisper_model = _get_whisper_model()
+        except Exception as e:
+            whisper_state.setdefault("error", e)
+            return None
+        return _transcribe_window(whisper_model, samples, rate, whisper_lang)
+
+    def _flush_window():
+        nonlocal window, window_start
+        if not window:
+            return
+        future = whisper_pool.submit(
+            _transcribe_job,
+            [turn_samples[pos] for pos in window],
+            sample_rate,
+        )
+        window_jobs.append((window, window_start, future))
+        window = []
+        window_start = current_offset
+
+    # Consume TTS results as they finish, but hand them on in script order:
+    # out-of-order results wait in a small heap until the gap before them fills
+    ready = []
+    next_index = 0
+    for future in as_completed(future_to_turn):
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Error in TTS thread: {e}")
+            result = None
+        turn_index = future_to_turn[future]
+        heapq.heappush(ready, (turn_index, result or {}))
+        for repeat_index in repeats.get(turn_index, ()):
+            # Repeats only read the audio, so they can share the same file
+            repeat = dict(result, index=repeat_index) if result else {}
+            heapq.heappush(ready, (repeat_index, repeat))
+
+        while ready and ready[0][0] == next_index:
+            _, item = heapq.heappop(ready)
+            next_index += 1
+            if not item:
+                continue
+            samples = item["samples"]
+            if sample_rate is None:
+                sample_rate = item["sample_rate"]
+            else:
+                samples = _resample(samples, item["sample_rate"], sample_rate)
+            turn_samples.append(samples)
+            clip_items.append(item)
+            turn_offsets.append(current_offset)
+            if item.get("word_timings") is not None:
+                # The service already timed this turn: close the open window
+                # (windows must stay contiguous) and skip Whisper for it
+                _flush_window()
+                words_per_turn.append(item["word_timings"])
+                word_offsets.append(current_offset)
+                current_offset += len(samples) / sample_rate
+                window_start = current_offset
+                continue
+            window.append(len(turn_samples) - 1)
+            words_per_turn.append([])
+            word_offsets.append(0.0)
+            current_offset += len(samples) / sample_rate
+            if current_offset - window_start >= WHISPER_WINDOW_SECONDS:
+                _flush_window()
 
     # print(f"  > TTS Phase completed in {time.time() - start_time:.2f}s")
 
-    # --- PHASE 2: WHISPER TRANSCRIPTION FOR WORD TIMESTAMPS ---
-    # print(f"  > Loading Whisper model ({WHISPER_DEVICE}) once for all turns...")
-
-    # Load model ONCE for all turns
-    try:
-        with suppress_output():
-            whisper_model = whisper.load_model("tiny", device=WHISPER_DEVICE)
-    except Exception as e:
-        print(f"Error loading Whisper model: {e}")
-        return None, []
-
-    all_word_data = []
-    audio_clips = []
-    current_offset = 0.0
-
-    # print("  > Starting Whisper transcription...")
+    if not clip_items:
+        whisper_pool.shutdown(wait=False)
+        raise Exception("Failed to generate any audio files.")
 
-    for item in tts_results:
-        turn_index = item["index"]
-        audio_path = item["audio_path"]
-        role = item["role"]
+    _flush_window()
 
+    # Fresh transcriptions are also cached next to their clips, so a rebuild
+    # of the same lines skips Whisper like a service-timed turn does
+    cached_timings = set()
+    for positions, window_offset, future in window_jobs:
         try:
-            # 1. Transcribe with Whisper to get word-level timestamps
-            with suppress_output():
-                # Use language_code for Whisper (ISO 639-1), fallback to "en"
-                whisper_lang = language_code if language_code else "en"
-                result = whisper.transcribe(
-                    whisper_model, audio_path, language=whisper_lang, verbose=False
-                )
-
-            # 2. Get original text (emotion tags already stripped by TTS)
-            original_text = item.get("text", "")
-            original_words = _tokenize_text(original_text) if original_text else []
-
-            # 3. Extract word data from Whisper result (timing only)
-            #    Replace transcribed word text with original script words for accuracy
-            turn_word_data = []
-            whisper_words = []
-            for segment in result["segments"]:
-                for word in segment["words"]:
-                    whisper_words.append(word)
-
-            # Use original words if counts match, otherwise use a proportional mapping
-            if len(original_words) == len(whisper_words):
-                for i, w in enumerate(whisper_words):
-                    turn_word_data.append(
-                        {
-                            "word": original_words[i],
-                            "start": w["start"],
-                            "end": w["end"],
-                            "role": role,
-                        }
-                    )
-            elif len(original_words) > 0:
-                # Proportional mapping: distribute Whisper timestamps across original words
-                total_duration = whisper_words[-1]["end"] if whisper_words else 0
-                per_word = total_duration / len(original_words) if original_words else 0
-                for i, word_text in enumerate(original_words):
-                    turn_word_data.append(
-                        {
-                            "word": word_text,
-                            "start": i * per_word,
-                            "end": (i + 1) * per_word,
-                            "role": role,
-                        }
-                    )
-            else:
-                # Fallback: use Whisper output directly
-                for w in whisper_words:
-                    turn_word_data.append(
-                        {
-                            "word": w["text"],
-                            "start": w["start"],
-                            "end": w["end"],
-                            "role": role,
-                        }
-                    )
-
-            # 3. Apply offset for multi-turn concatenation
-            for word in turn_word_data:
-                word["start"] += current_offset
-                word["end"] += current_offset
-                all_word_data.append(word)
-
-            # 4. Load Audio Clip for concatenation
-            with suppress_output():
-                clip = AudioFileClip(audio_path)
-            audio_clips.append(clip)
-            current_offset += clip.duration
-
+            window_words = future.result()
         except Exception as e:
-            print(f"Error processing audio for turn {turn_index}: {e}")
+            print(f"Error transcribing audio: {e}")
             continue
+        for pos, words in zip(positions, window_words or ()):
+            words_per_turn[pos] = words
+            word_offsets[pos] = window_offset
+            cache_path = clip_items[pos].get("cache_path")
+            if cache_path and cache_path not in cached_timings:
+                cached_timings.add(cache_path)
+                _cache_whisper_timings(
+                    cache_path, words, turn_offsets[pos] - window_offset
+                )
+    whisper_pool.shutdown()
 
-    if not audio_clips:
-        raise Exception("Failed to generate any audio clips. Cannot create reel.")
-
-    final_audio_clip = concatenate_audioclips(audio_clips)
+    if "error" in whisper_state:
+        print(f"Error loading Whisper model: {whisper_state['error']}")
+        return None, []
 
-    # Normalize timestamps to match actual audio duration (eliminates drift)
-    if all_word_data:
-        true_duration = final_audio_clip.duration
-        whisper_total_time = all_word_data[-1]["end"] if all_word_data else 0.0
+    # Concatenate the already-decoded PCM once and serve it to moviepy from
+    # memory (as stereo, like AudioFileClip did) instead of re-reading a file
+    pcm = np.concatenate(turn_samples)
+    final_audio_clip = AudioArrayClip(np.column_stack((pcm, pcm)), fps=sample_rate)
+    turn_starts = (
+        np.cumsum([0] + [len(samples) for samples in turn_samples[:-1]]) / sample_rate
+    )
 
-        if whisper_total_time > 0 and abs(true_duration - whisper_total_time) > 0.1:
-            scale_factor = true_duration / whisper_total_time
+    # Whisper times are window-relative; each turn's offset is added to its
+    # timing arrays in one vectorized step, and the arrays are joined once
+    start_chunks, end_chunks, words, roles = [], [], [], []
+    for item, turn_start, offset, whisper_words in zip(
+        clip_items, turn_starts, word_offsets, words_per_turn
+    ):
+        turn_start = float(turn_start)
+
+        # Original text (emotion tags already stripped by TTS)
+        original_text = item.get("text", "")
+        original_words = _tokenize_text(original_text) if original_text else []
+
+        # Replace transcribed word text with original script words for accuracy.
+        # Use original words if counts match, otherwise use a proportional mapping
+        if original_words and len(original_words) != len(whisper_words):
+            # Proportional mapping: distribute Whisper timestamps across original words
+            total_duration = (
+                whisper_words[-1]["end"] + offset - turn_start if whisper_words else 0
+            )
+            word_count = len(original_words)
+            edges = turn_start + (total_duration / word_count) * np.arange(
+                word_count + 1
+            )
+            start_chunks.append(edges[:-1])
+            end_chunks.append(edges[1:])
+            words.extend(original_words)
         else:
-            scale_factor = 1.0
-
-        for word_data in all_word_data:
-            word_data["start"] *= scale_factor
-            word_data["end"] *= scale_factor
-
-    return final_audio_clip, all_word_data
+            # Whisper timing, with script words when the counts match
+            # (otherwise the Whisper text itself as a fallback)
+            word_count = len(whisper_words)
+            start_chunks.append(
+                np.fromiter((w["start"] for w in whisper_words), float, word_count)
+                + offset
+            )
+            end_chunks.append(
+                np.fromiter((w["end"] for w in whisper_words), float, word_count)
+                + offset
+            )
+            words.extend(original_words or (w["text"] for w in whisper_words))
+        roles.extend([item["role"]] * word_count)
+
+    word_data = WordData(
+        np.concatenate(start_chunks) if start_chunks else np.empty(0),
+        np.concatenate(end_chunks) if end_chunks else np.empty(0),
+        words,
+        roles,
+    )
+    return final_audio_clip, word_data
 
 
-def filter_word_data(word_data_list):
+def filter_word_data(word_data):
     """Filters out words that are too short to display."""
-    filtered = []
-
-    # Require at least one word character (Unicode-aware — supports Devanagari, CJK, etc.)
-    word_pattern = re.compile(r"\w", re.UNICODE)
-
-    for word in word_data_list:
-        duration = word["end"] - word["start"]
-        has_word_char = word_pattern.search(word["word"])
-        if duration >= MIN_CLIP_DURATION and has_word_char:
-            filtered.append(word)
-
-    return filtered
+    # Check every duration in one vectorized pass, then run the regex only on
+    # the words that survived it
+    keep = (word_data.ends - word_data.starts) >= MIN_CLIP_DURATION
+    words = word_data.words
+    for i in np.flatnonzero(keep).tolist():
+        if not _has_word_char(words[i]):
+            keep[i] = False
+
+    indices = np.flatnonzero(keep)
+    return WordData(
+        word_data.starts[indices],
+        word_data.ends[indices],
+        [word_data.words[i] for i in indices.tolist()],
+        [word_data.roles[i] for i in indices.tolist()],
+    )
 
 
 # --- JSON INPUT LOAD UTILITY ---
@@ -619,8 +1049,7 @@ def filter_word_data(word_data_list):
 def load_input_json(file_path):
     """Loads and validates the input JSON content file."""
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        data = load_json_file(file_path)
 
         ordered_turns = data["conversation"]
         # Support both top-level languageCode and nested metadata.language
@@ -633,12 +1062,17 @@ def load_input_json(file_path):
                 "JSON file must contain a non-empty list under the 'conversation' key."
             )
 
-        # Basic validation of turn structure
+        # Validate the turn structure and intern roles in the same pass: roles
+        # repeat on every turn and key several dict lookups per turn
+        # (CHARACTER_MAP, the voice cache); interned strings compare by identity
         for turn in ordered_turns:
             if "role" not in turn or "text" not in turn:
                 raise ValueError(
                     "Each turn in 'conversation' must have 'role' and 'text' keys."
                 )
+            if not isinstance(turn["role"], str):
+                raise ValueError("Each turn's 'role' must be a string.")
+            turn["role"] = sys.intern(turn["role"])
 
         return ordered_turns, language_code
 
@@ -1,9 +1,12 @@
 # processors/reel_generator.py
 
+import functools
 import glob
+import math
 import os
 import random
 import shutil
+import subprocess
 import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -22,11 +25,11 @@ if not hasattr(Image, "ANTIALIAS"):
 
 
 from moviepy.editor import (
-    AudioClip,
+    CompositeAudioClip,
     CompositeVideoClip,
     ImageClip,
+    VideoClip,
     VideoFileClip,
-    concatenate_audioclips,
     vfx,
 )
 
@@ -119,6 +122,205 @@ def _get_font(size):
     return _FONT_CACHE[size]
 
 
+def _generate_word_image(word_text):
+    """Generates a PIL image for a single (already upper-cased) word."""
+    # Use a safety margin of 20% on each side
+    margin = TARGET_W * 0.20
+    max_width = TARGET_W - (2 * margin)
+
+    current_font_size = FONT_SIZE
+
+    # Dummy draw for measurement
+    temp_img = Image.new("RGBA", (1, 1))
+    temp_draw = ImageDraw.Draw(temp_img)
+
+    def measure_text(text, size):
+        font = _get_font(size)
+        bbox = temp_draw.textbbox((0, 0), text, font=font, stroke_width=STROKE_WIDTH)
+        width = bbox[2] - bbox[0]
+        height = bbox[3] - bbox[1]
+        return font, width, height
+
+    font, w, h = measure_text(word_text, current_font_size)
+
+    # Shrink if too big
+    while current_font_size > 20 and w > max_width:
+        current_font_size -= 4
+        font, w, h = measure_text(word_text, current_font_size)
+
+    # Create canvas (tight fit with padding for stroke)
+    padding = STROKE_WIDTH * 2 + 10
+    canvas_w = int(w + padding * 2)
+    canvas_h = int(h + padding * 2)
+
+    canvas = Image.new("RGBA", (canvas_w, canvas_h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(canvas)
+
+    # Draw text centered
+    draw.text(
+        (padding, padding),
+        word_text,
+        font=font,
+        fill=TEXT_COLOR,
+        stroke_width=STROKE_WIDTH,
+        stroke_fill=STROKE_COLOR,
+    )
+
+    return canvas
+
+
+@functools.lru_cache(maxsize=512)
+def _word_image_arrays(word_text):
+    """
+    Rasterizes a caption word once and returns its RGB array and float32 alpha
+    mask. Captions repeat words heavily ("THE", "YOU"), so repeats reuse the
+    arrays; ImageClip never writes to them.
+    """
+    img_array = np.array(_generate_word_image(word_text))
+    return img_array[:, :, :3], img_array[:, :, 3].astype(np.float32) / 255.0
+
+
+def _preprocess_avatar_image(source_path, flip, role):
+    """
+    Pre-processes a single avatar image (resize/flip/save) into TEMP_DIR.
+    The result is reused across reels until the source image changes.
+    """
+    temp_file_name = f"avatar_{role}_{'flipped' if flip else 'orig'}_{os.path.basename(source_path)}"
+    final_avatar_path = os.path.join(TEMP_DIR, temp_file_name)
+    key = (source_path, flip)
+
+    try:
+        if os.path.getmtime(final_avatar_path) >= os.path.getmtime(source_path):
+            return key, final_avatar_path
+    except OSError:
+        pass
+
+    try:
+        # 1. Open
+        img = Image.open(source_path)
+
+        # 2. Resize
+        original_w, original_h = img.size
+        new_h = int((AVATAR_WIDTH / original_w) * original_h)
+        img = img.resize((AVATAR_WIDTH, new_h), Image.Resampling.LANCZOS)
+
+        # 3. Flip
+        if flip:
+            img = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+
+        # 4. Convert
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+
+        # Write then rename, so a concurrent reel never reads a partial PNG.
+        # This is a temp file: fast zlib level 1 beats a smaller file here.
+        partial_path = f"{final_avatar_path}.{uuid.uuid4().hex}.part"
+        img.save(partial_path, "PNG", compress_level=1)
+        os.replace(partial_path, final_avatar_path)
+        return key, final_avatar_path
+
+    except Exception as e:
+        print(f"Error processing avatar image {source_path}: {e}")
+        return key, source_path  # Fallback
+
+
+# Avatar "speaking" bounce: scale oscillates between 1 and AVATAR_BOUNCE_MAX_SCALE
+AVATAR_BOUNCE_FREQ = 4.0
+AVATAR_BOUNCE_MAX_SCALE = 1.02
+# A 2% range is visually continuous at this many steps
+AVATAR_SCALE_LEVELS = 8
+
+
+def _avatar_scale_sprites(img):
+    """
+    Pre-renders an RGBA avatar at AVATAR_SCALE_LEVELS sizes as (RGB, alpha)
+    arrays, so the bounce animation picks a sprite per frame instead of
+    resizing the image on every frame.
+    """
+    w, h = img.size
+    sprites = []
+    for level in range(AVATAR_SCALE_LEVELS):
+        scale = 1 + (AVATAR_BOUNCE_MAX_SCALE - 1) * level / (AVATAR_SCALE_LEVELS - 1)
+        size = (round(w * scale), round(h * scale))
+        scaled = img if size == img.size else img.resize(size, Image.Resampling.LANCZOS)
+        rgba = np.array(scaled)
+        sprites.append((rgba[:, :, :3], rgba[:, :, 3].astype(np.float32) / 255.0))
+    return sprites
+
+
+# --- Video Encoder Selection ---
+NVENC_CODEC = "h264_nvenc"
+# Set once an NVENC render fails, so later reels go straight to VIDEO_CODEC
+_NVENC_DISABLED = False
+
+
+@functools.lru_cache(maxsize=1)
+def _nvenc_available():
+    """
+    True when ffmpeg can actually encode with NVENC here. Probed once with a tiny
+    test encode: the encoder list only reflects ffmpeg's build flags, while the
+    driver (and a free NVENC session) is only known at runtime.
+    """
+    if not shutil.which("nvidia-smi"):
+        return False
+    try:
+        import imageio_ffmpeg
+
+        result = subprocess.run(
+            [
+                imageio_ffmpeg.get_ffmpeg_exe(),
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "color=c=black:s=256x256:d=0.1",
+                "-frames:v",
+                "1",
+                "-c:v",
+                NVENC_CODEC,
+                "-f",
+                "null",
+                "-",
+            ],
+            capture_output=True,
+            timeout=10,
+        )
+    except Exception:
+        return False
+    return result.returncode == 0
+
+
+def _video_codec():
+    """Returns the codec for MoviePy renders: NVENC when it works, else VIDEO_CODEC."""
+    if VIDEO_CODEC == "libx264" and not _NVENC_DISABLED and _nvenc_available():
+        return NVENC_CODEC
+    return VIDEO_CODEC
+
+
+def _disable_nvenc():
+    """Remembers an NVENC failure for the rest of the process."""
+    global _NVENC_DISABLED
+    _NVENC_DISABLED = True
+
+
+# In-progress renders live in OUTPUT_DIR under this (hidden) prefix
+PARTIAL_REEL_PREFIX = ".tmp_"
+
+
+def remove_partial_reels():
+    """
+    Deletes renders left in OUTPUT_DIR by a process that died mid-render
+    (the finally block in create_reel never ran). Call before rendering starts.
+    """
+    for path in glob.glob(os.path.join(OUTPUT_DIR, f"{PARTIAL_REEL_PREFIX}*")):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"Cleanup Warning: {e}")
+
+
 class ReelGenerator:
     """
     A class to manage the end-to-end process of generating an Instagram Reel
@@ -132,7 +334,11 @@ class ReelGenerator:
         self.base_name = os.path.basename(input_json_path).replace(".json", "")
         self.final_reel_name = f"{self.base_name}.mp4"
         self.final_output_path = os.path.join(OUTPUT_DIR, self.final_reel_name)
-        self.temp_output_file = os.path.join(TEMP_DIR, f"temp_reel_{uuid.uuid4()}.mp4")
+        # Rendered next to the final file (hidden from the *.mp4 listings) so the
+        # finished reel is published with an atomic rename, not a cross-device copy
+        self.temp_output_file = os.path.join(
+            OUTPUT_DIR, f"{PARTIAL_REEL_PREFIX}{uuid.uuid4()}_{self.final_reel_name}"
+        )
         self.video_file = self._get_random_video_file()
 
         # Pick a random highlight color from the palette
@@ -157,135 +363,73 @@ class ReelGenerator:
 
         return random.choice(all_videos)
 
-    def _generate_single_word_image(self, word_text):
-        """Generates a PIL image for a single word."""
-        word_text = word_text.upper()
-
-        # Use a safety margin of 20% on each side
-        margin = TARGET_W * 0.20
-        max_width = TARGET_W - (2 * margin)
-
-        current_font_size = FONT_SIZE
-
-        # Dummy draw for measurement
-        temp_img = Image.new("RGBA", (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
-
-        def measure_text(text, size):
-            font = _get_font(size)
-            bbox = temp_draw.textbbox(
-                (0, 0), text, font=font, stroke_width=STROKE_WIDTH
-            )
-            width = bbox[2] - bbox[0]
-            height = bbox[3] - bbox[1]
-            return font, width, height
-
-        font, w, h = measure_text(word_text, current_font_size)
-
-        # Shrink if too big
-        while current_font_size > 20 and w > max_width:
-            current_font_size -= 4
-            font, w, h = measure_text(word_text, current_font_size)
-
-        # Create canvas (tight fit with padding for stroke)
-        padding = STROKE_WIDTH * 2 + 10
-        canvas_w = int(w + padding * 2)
-        canvas_h = int(h + padding * 2)
-
-        canvas = Image.new("RGBA", (canvas_w, canvas_h), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(canvas)
-
-        # Draw text centered
-        draw.text(
-            (padding, padding),
-            word_text,
-            font=font,
-            fill=TEXT_COLOR,
-            stroke_width=STROKE_WIDTH,
-            stroke_fill=STROKE_COLOR,
-        )
-
-        return canvas
-
-    def _process_single_text_clip(self, word_data, offset):
-        """Helper to create a single text clip (for parallel execution)."""
-        word_text = word_data["word"]
-        start_time_word = word_data["start"]
-        end_time_word = word_data["end"]
-        word_duration = end_time_word - start_time_word
-
-        if word_duration < MIN_CLIP_DURATION:
-            return None
-
-        try:
-            pil_img = self._generate_single_word_image(word_text)
-            img_array = np.array(pil_img)
-
-            txt_clip = ImageClip(img_array).set_duration(word_duration)
-
-            if img_array.shape[2] == 4:
-                mask_clip = ImageClip(
-                    img_array[:, :, 3] / 255.0, ismask=True
-                ).set_duration(word_duration)
-                txt_clip = txt_clip.set_mask(mask_clip)
-
-            txt_clip = txt_clip.set_start(start_time_word + offset).set_pos(
-                ("center", "center")
-            )
-
-            return txt_clip
-        except Exception as e:
-            print(f"Error creating text clip for '{word_text}': {e}")
-            return None
-
     def _create_text_clips(self, word_data_list):
-        """Create animated text clips for all words in parallel."""
-        text_clips = []
-
+        """
+        Creates the caption layer as a single clip that shows whichever word
+        is active at time t, instead of one ImageClip (plus mask) per word
+        that CompositeVideoClip would have to check on every frame.
+        """
         if not word_data_list:
             print("Error: No word data available to create captions.")
             return []
 
         offset = VIDEO_PADDING_START
+        starts, ends, sprites = [], [], []
+        for word_data in sorted(word_data_list, key=lambda w: w["start"]):
+            if word_data["end"] - word_data["start"] < MIN_CLIP_DURATION:
+                continue
+            try:
+                sprites.append(_word_image_arrays(word_data["word"].upper()))
+            except Exception as e:
+                print(f"Error creating text clip for '{word_data['word']}': {e}")
+                continue
+            starts.append(word_data["start"] + offset)
+            ends.append(word_data["end"] + offset)
 
-        with ThreadPoolExecutor() as executor:
-            futures = [
-                executor.submit(self._process_single_text_clip, word_data, offset)
-                for word_data in word_data_list
-            ]
+        if not sprites:
+            return []
 
-            for future in as_completed(futures):
-                result = future.result()
-                if result:
-                    text_clips.append(result)
+        starts = np.array(starts)
+        ends = np.array(ends)
+        blank = (np.zeros((1, 1, 3), np.uint8), np.zeros((1, 1), np.float32))
+
+        def sprite_at(t):
+            i = int(np.searchsorted(starts, t, side="right")) - 1
+            if i < 0 or t >= ends[i]:
+                return blank
+            return sprites[i]
 
-        return text_clips
+        # Frames take the size of the active word; the blit centers each one
+        duration = float(ends.max())
+        captions = VideoClip(
+            lambda t: sprite_at(t)[0], duration=duration, has_constant_size=False
+        )
+        mask = VideoClip(
+            lambda t: sprite_at(t)[1],
+            ismask=True,
+            duration=duration,
+            has_constant_size=False,
+        )
+        return [captions.set_mask(mask).set_pos(("center", "center"))]
 
     def _get_speaker_segments(self, word_data_list):
         """Groups word data into speaker segments (turns)."""
-        speaker_segments = []
-        active_role = None
+        if not word_data_list:
+            return []
 
-        for word_data in word_data_list:
-            role = word_data["role"]
-            current_start = word_data["start"]
-            current_end = word_data["end"]
-
-            if role != active_role:
-                if active_role is not None and speaker_segments:
-                    speaker_segments[-1]["end"] = current_start
-
-                active_role = role
-                speaker_segments.append(
-                    {
-                        "role": role,
-                        "start": current_start,
-                        "end": current_end,
-                    }
-                )
-            else:
-                speaker_segments[-1]["end"] = current_end
-        return speaker_segments
+        # Run-length encode the roles: a segment starts wherever the role changes
+        roles = np.array([w["role"] for w in word_data_list], dtype=object)
+        starts = np.fromiter(
+            (w["start"] for w in word_data_list), float, len(word_data_list)
+        )
+        first_words = np.flatnonzero(np.r_[True, roles[1:] != roles[:-1]])
+
+        # A turn lasts until the next speaker starts; the last one until its last word
+        segment_ends = np.r_[starts[first_words[1:]], word_data_list[-1]["end"]]
+        return [
+            {"role": roles[i], "start": float(starts[i]), "end": end}
+            for i, end in zip(first_words.tolist(), segment_ends.tolist())
+        ]
 
     def _create_pip_asset_clip(self, start_time, end_time):
         """
@@ -347,43 +491,7 @@ class ReelGenerator:
             print(f"Error creating PIP asset clip: {e}")
             return None
 
-    def _preprocess_avatar_image(self, source_path, flip, role):
-        """Helper to pre-process a single avatar image (resize/flip/save)."""
-        temp_file_name = f"avatar_{role}_{'flipped' if flip else 'orig'}_{os.path.basename(source_path)}"
-        final_avatar_path = os.path.join(TEMP_DIR, temp_file_name)
-
-        # Check if already exists in temp (persistence across runs if needed, or just this run)
-        # For now, we assume we want to ensure it's fresh or strictly managed.
-        # But if we parallelize, multiple calls might try to write.
-        # We should use a unique key or check existence carefully.
-
-        key = (source_path, flip)
-
-        try:
-            # 1. Open
-            img = Image.open(source_path)
-
-            # 2. Resize
-            original_w, original_h = img.size
-            new_h = int((AVATAR_WIDTH / original_w) * original_h)
-            img = img.resize((AVATAR_WIDTH, new_h), Image.Resampling.LANCZOS)
-
-            # 3. Flip
-            if flip:
-                img = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
-
-            # 4. Convert
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-
-            img.save(final_avatar_path, "PNG")
-            return key, final_avatar_path
-
-        except Exception as e:
-            print(f"Error processing avatar image {source_path}: {e}")
-            return key, source_path  # Fallback
-
-    def _create_avatar_clips(self, word_data_list):
+    def _create_avatar_clips(self, word_data_list, speaker_segments=None):
         """Create animated avatar clips based on the active speaker (role) using Pillow
         for robust transparency and flipping."""
         avatar_clips = []
@@ -409,8 +517,9 @@ class ReelGenerator:
                     break
         # ---------------------------------
 
-        # 3. Get speaker segments
-        speaker_segments = self._get_speaker_segments(word_data_list)
+        # 3. Get speaker segments (unless the caller already computed them)
+        if speaker_segments is None:
+            speaker_segments = self._get_speaker_segments(word_data_list)
 
         # 4. Identify Unique Processing Jobs
         processing_jobs = {}  # Key: (source_path, flip) -> role (just for naming)
@@ -442,7 +551,7 @@ class ReelGenerator:
 
         with ThreadPoolExecutor() as executor:
             futures = [
-                executor.submit(self._preprocess_avatar_image, src, flip, role)
+                executor.submit(_preprocess_avatar_image, src, flip, role)
                 for (src, flip), role in processing_jobs.items()
             ]
 
@@ -450,7 +559,8 @@ class ReelGenerator:
                 key, path = future.result()
                 processed_avatar_paths[key] = path
 
-        # 6. Create Clips
+        # 6. Create Clips (each avatar is decoded and pre-scaled once, not per segment)
+        avatar_sprites = {}
         for segment in speaker_segments:
             role = segment["role"]
             start = segment["start"]
@@ -479,11 +589,15 @@ class ReelGenerator:
             # --- MOVIEPY CLIPPING ---
             try:
                 # Load the pre-processed image
-                avatar_clip = ImageClip(final_avatar_path, duration=duration)
+                if final_avatar_path not in avatar_sprites:
+                    with Image.open(final_avatar_path) as img:
+                        avatar_sprites[final_avatar_path] = _avatar_scale_sprites(
+                            img.convert("RGBA")
+                        )
 
                 # Apply the continuous smoother speaking animation
                 animated_avatar = self._apply_avatar_speaking_animation(
-                    avatar_clip, duration
+                    avatar_sprites[final_avatar_path], duration
                 )
 
                 # Apply start time offset
@@ -500,7 +614,7 @@ class ReelGenerator:
 
         return avatar_clips
 
-    def _get_avatar_metadata(self, word_data_list):
+    def _get_avatar_metadata(self, word_data_list, speaker_segments=None):
         """Extract metadata for PyAVRenderer to avoid MoviePy overhead."""
         metadata = []
         offset = VIDEO_PADDING_START
@@ -522,7 +636,8 @@ class ReelGenerator:
                 else:
                     break
 
-        speaker_segments = self._get_speaker_segments(word_data_list)
+        if speaker_segments is None:
+            speaker_segments = self._get_speaker_segments(word_data_list)
 
         # Parallel pre-processing
         processing_jobs = {}
@@ -541,7 +656,7 @@ class ReelGenerator:
         processed_paths = {}
         with ThreadPoolExecutor() as executor:
             futures = [
-                executor.submit(self._preprocess_avatar_image, src, flip, role)
+                executor.submit(_preprocess_avatar_image, src, flip, role)
                 for (src, flip), role in processing_jobs.items()
             ]
             for f in as_completed(futures):
@@ -597,19 +712,28 @@ class ReelGenerator:
             "end": end_time,
         }
 
-    def _apply_avatar_speaking_animation(self, clip, segment_duration):
+    def _apply_avatar_speaking_animation(self, sprites, segment_duration):
         """Creates a continuous, subtle, repeating bounce/scale effect for an avatar."""
-
-        # Animation parameters (Smoother settings)
-        freq = 4.0
-        max_scale = 1.02
-
-        def scale_func(t):
-            # Sinusoidal scaling:
-            scale = 1 + (max_scale - 1) * 0.5 * (1 + np.sin(2 * np.pi * freq * t))
-            return scale
-
-        return clip.fx(vfx.resize, scale_func)
+        angular_freq = 2 * math.pi * AVATAR_BOUNCE_FREQ
+        last_level = len(sprites) - 1
+
+        def sprite_at(t):
+            # Sinusoidal scaling, snapped to the nearest pre-scaled sprite
+            phase = 0.5 * (1 + math.sin(angular_freq * t))
+            return sprites[round(phase * last_level)]
+
+        clip = VideoClip(
+            lambda t: sprite_at(t)[0],
+            duration=segment_duration,
+            has_constant_size=False,
+        )
+        mask = VideoClip(
+            lambda t: sprite_at(t)[1],
+            ismask=True,
+            duration=segment_duration,
+            has_constant_size=False,
+        )
+        return clip.set_mask(mask)
 
     def _prepare_video(self, required_duration):
         """Loads, loops/subclips, resizes, and crops the background video."""
@@ -622,7 +746,11 @@ class ReelGenerator:
         self.bg_start_time = 0.0
 
         with suppress_output():
-            video = VideoFileClip(self.video_file)
+            # ffmpeg scales to the target height while decoding, and the
+            # background's own audio track is never used (the TTS replaces it)
+            video = VideoFileClip(
+                self.video_file, target_resolution=(TARGET_H, None), audio=False
+            )
 
             if video.duration < total_duration:
                 # Loop the video if it's shorter than required
@@ -636,7 +764,6 @@ class ReelGenerator:
                     start_time, start_time + total_duration
                 )
 
-            final_video_clip = final_video_clip.fx(vfx.resize, height=TARGET_H)
             video_w = final_video_clip.w
             x_start = (video_w - TARGET_W) / 2
             final_video_clip = final_video_clip.crop(x1=x_start, width=TARGET_W)
@@ -670,7 +797,7 @@ class ReelGenerator:
 
             # 2. Generate Custom Audio and get Word Timestamps
             tts_audio_clip, word_data_list = generate_multi_role_audio_multiprocess(
-                ordered_turns, language_code, audio_mode, reel_name=self.base_name
+                ordered_turns, language_code, audio_mode
             )
 
             if tts_audio_clip is None:
@@ -679,8 +806,10 @@ class ReelGenerator:
 
             required_caption_duration = tts_audio_clip.duration
 
-            # 3. Filter Word Data
-            word_data_list = filter_word_data(word_data_list)
+            # 3. Filter Word Data (columnar), then expand for the clip builders
+            word_data_list = filter_word_data(word_data_list).to_dicts()
+            # Avatars, PIP timing and the PyAV metadata all use the same turns
+            speaker_segments = self._get_speaker_segments(word_data_list)
 
             # 4-6. Prepare Background Video, Text Clips, and Avatar Clips IN PARALLEL
             #       These stages are independent and can run concurrently.
@@ -697,7 +826,7 @@ class ReelGenerator:
                     else None
                 )
                 avatar_future = executor.submit(
-                    self._create_avatar_clips, word_data_list
+                    self._create_avatar_clips, word_data_list, speaker_segments
                 )
 
                 final_video_clip = video_future.result()
@@ -706,7 +835,6 @@ class ReelGenerator:
 
             # 7.5 Create PIP Asset Clip (Optional)
             offset = VIDEO_PADDING_START
-            speaker_segments = self._get_speaker_segments(word_data_list)
             pip_clips = []
             if len(speaker_segments) >= 3:
                 # Start after first line finishes (end of first segment)
@@ -733,14 +861,12 @@ class ReelGenerator:
                 pass
 
             # 8. Pad audio with silence at the start
-            # Create a silent audio clip of the padding duration (0.5s)
-            silence_clip = AudioClip(lambda t: 0, duration=VIDEO_PADDING_START)
-
-            # Concatenate silence clip with the main audio clip
-            final_audio_clip = concatenate_audioclips([silence_clip, tts_audio_clip])
-
-            # Ensure the audio clip has the same duration as the final video clip
-            final_audio_clip = final_audio_clip.set_duration(final_video_clip.duration)
+            # Offsetting the clip inside a composite yields implicit silence before
+            # it, instead of evaluating a Python lambda per sample for the padding.
+            # The duration matches the final video clip.
+            final_audio_clip = CompositeAudioClip(
+                [tts_audio_clip.set_start(VIDEO_PADDING_START)]
+            ).set_duration(final_video_clip.duration)
 
             # NOTE: Avatar clips being empty is fine if the user is testing the fix.
             if not text_clips and not avatar_clips:
@@ -762,7 +888,9 @@ class ReelGenerator:
                 )
 
                 # Extract Avatar Metadata
-                avatar_metadata = self._get_avatar_metadata(word_data_list)
+                avatar_metadata = self._get_avatar_metadata(
+                    word_data_list, speaker_segments
+                )
 
                 # Extract PIP Metadata (if any)
                 pip_metadata = self._get_pip_metadata(
@@ -794,25 +922,42 @@ class ReelGenerator:
 
                 with suppress_output():
                     ffmpeg_params = ["-pix_fmt", "yuv420p", "-movflags", "+faststart"]
+                    codec = _video_codec()
                     write_kwargs = dict(
                         fps=24,
-                        codec=VIDEO_CODEC,
+                        codec=codec,
                         audio_codec="aac",
                         temp_audiofile=os.path.join(
                             TEMP_DIR, f"temp-audio-{uuid.uuid4()}.m4a"
                         ),
                         remove_temp=True,
-                        threads=6,
+                        threads=0,  # let the encoder size its own thread pool
                         logger=None,
                         ffmpeg_params=ffmpeg_params,
                     )
-                    if VIDEO_CODEC == "libx264":
+                    if codec == "libx264":
                         write_kwargs["preset"] = "ultrafast"
-
-                    final_clip.write_videofile(self.temp_output_file, **write_kwargs)
+                    elif codec == NVENC_CODEC:
+                        write_kwargs["preset"] = "p4"
+
+                    try:
+                        final_clip.write_videofile(
+                            self.temp_output_file, **write_kwargs
+                        )
+                    except Exception as e:
+                        if codec != NVENC_CODEC:
+                            raise
+                        # e.g. NVENC session limit or no video capability in a
+                        # container: fall back to x264 for this and later reels
+                        _disable_nvenc()
+                        print(f"NVENC encode failed ({e}); retrying with libx264.")
+                        write_kwargs.update(codec="libx264", preset="ultrafast")
+                        final_clip.write_videofile(
+                            self.temp_output_file, **write_kwargs
+                        )
 
             # 10. Move to Final Location
-            shutil.move(self.temp_output_file, self.final_output_path)
+            os.replace(self.temp_output_file, self.final_output_path)
             print(
                 f"✅ Reel successfully created in {time.time() - total_start_time:.2f}s"
             )
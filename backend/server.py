@@ -161,8 +161,11 @@ try:
             TEMP_DIR,
             VIDEO_DIR,
             WEB_APP_OUT_DIR,
+            fast_rmtree,
+            load_json_file,
         )
-        from .processors.reel_generator import ReelGenerator
+        from .processors.audio_generator import get_voice_id_for_role
+        from .processors.reel_generator import ReelGenerator, remove_partial_reels
         from .services.caption_generator import generate_caption
         from .services.content_writer import generate_content as generate_content_gemini
         from .services.deepseek_writer import (
@@ -187,8 +190,11 @@ try:
             TEMP_DIR,
             VIDEO_DIR,
             WEB_APP_OUT_DIR,
+            fast_rmtree,
+            load_json_file,
         )
-        from processors.reel_generator import ReelGenerator
+        from processors.audio_generator import get_voice_id_for_role
+        from processors.reel_generator import ReelGenerator, remove_partial_reels
         from services.caption_generator import generate_caption
         from services.content_writer import generate_content as generate_content_gemini
         from services.deepseek_writer import (
@@ -214,7 +220,7 @@ def cleanup_temp_dir():
     """Removes temporary directory and contents."""
     if os.path.exists(TEMP_DIR):
         try:
-            shutil.rmtree(TEMP_DIR)
+            fast_rmtree(TEMP_DIR)
         except Exception as e:
             print(f"Cleanup Warning: {e}")
 
@@ -280,6 +286,28 @@ from fastapi.staticfiles import StaticFiles
 # --- FastAPI Setup ---
 app = FastAPI(title="Faceless Reel Generator API")
 
+# --- CORS ---
+# The UI is served by this backend (8008) or the Next.js dev server (3031), and
+# may be opened via localhost, the LAN IP or a hostname, so origins are matched
+# by port. Attached once at import; preflight responses are cached for a day.
+CORS_ALLOWED_ORIGINS = [
+    "http://localhost:8008",
+    "http://127.0.0.1:8008",
+    "http://localhost:3031",
+    "http://127.0.0.1:3031",
+]
+CORS_ALLOWED_ORIGIN_REGEX = r"https?://[^/:]+:(8008|3031)"
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=CORS_ALLOWED_ORIGINS,
+    allow_origin_regex=CORS_ALLOWED_ORIGIN_REGEX,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    max_age=86400,
+)
+
 app.mount("/reels", StaticFiles(directory=OUTPUT_DIR), name="reels")
 app.mount("/contents", StaticFiles(directory=INPUT_DIR), name="contents")
 app.mount("/avatars", StaticFiles(directory=AVATAR_DIR), name="avatars")
@@ -487,8 +515,7 @@ async def get_contents_api():
         dialogues = []
         data = {}
         try:
-            with open(f_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = load_json_file(f_path)
 
             # Extract dialogues from 'conversation' or 'content' keys
             dialogue_list = data.get("conversation", data.get("content", []))
@@ -756,8 +783,7 @@ async def update_content_api(file_name: str = Form(...), content: str = Form(...
         # Re-construct the JSON object
         # We try to preserve the original query/topic if possible
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                original_data = json.load(f)
+            original_data = load_json_file(file_path)
         except:
             original_data = {}
 
@@ -894,6 +920,9 @@ async def add_character_api(char: CharacterRequest):
         "voice_kokoro_mlx": char.voice_kokoro_mlx or char.voice_kokoro or "am_liam",
     }
 
+    # Voice lookups are memoized per role; drop them now that the map changed
+    get_voice_id_for_role.cache_clear()
+
     try:
         with open(CHARACTER_CONFIG_FILE, "w", encoding="utf-8") as f:
             json.dump(CHARACTER_MAP, f, indent=4)
@@ -1099,6 +1128,9 @@ async def startup_event():
     os.makedirs(CAPTION_DIR, exist_ok=True)
     os.makedirs(PIP_DIR, exist_ok=True)
 
+    # Drop partial renders orphaned by a previous process that was killed
+    remove_partial_reels()
+
     # Add initial log entry
     await log_buffer.add_log("Application startup: Directories confirmed.", "success")
     await log_buffer.add_log("Terminal log streaming enabled.", "info")
@@ -1112,19 +1144,7 @@ async def shutdown_event():
 
 # --- Execution Block (for main.py to call) ---
 def run_server():
-    """Function to start the Uvicorn server with CORS configured."""
-
-    # Configure CORS for Next.js frontend integration
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[
-            "*"
-        ],  # Be specific in production: e.g., ["http://localhost:3000"]
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
+    """Function to start the Uvicorn server (CORS is configured at import)."""
     uvicorn.run(app, host="0.0.0.0", port=8008)
 
 
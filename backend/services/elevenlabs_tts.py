@@ -1,5 +1,6 @@
 # elevenlabs_service.py
 
+import base64
 import os
 import sys
 from elevenlabs import ElevenLabs
@@ -68,4 +69,57 @@ def generate_audio(text, voice_id, output_path, turn_index):
     except Exception as e:
         # Print the error but re-raise for upstream handling
         print(f"ElevenLabs API Error for turn {turn_index}: {e}", file=sys.stderr)
-        raise
\ No newline at end of file
+        raise
+
+
+def _alignment_to_words(alignment):
+    """Groups ElevenLabs character timings into {"text", "start", "end"} words."""
+    words = []
+    current = []
+    word_start = word_end = 0.0
+    for char, start, end in zip(
+        alignment.characters,
+        alignment.character_start_times_seconds,
+        alignment.character_end_times_seconds,
+    ):
+        if char.isspace():
+            if current:
+                words.append({"text": "".join(current), "start": word_start, "end": word_end})
+                current = []
+            continue
+        if not current:
+            word_start = start
+        current.append(char)
+        word_end = end
+    if current:
+        words.append({"text": "".join(current), "start": word_start, "end": word_end})
+    return words
+
+
+def generate_audio_with_timestamps(text, voice_id, output_path, turn_index):
+    """
+    Generates audio like generate_audio, but also returns the word timings
+    ElevenLabs reports alongside it, so callers can skip forced alignment.
+    """
+    if not ELEVEN_CLIENT:
+        raise Exception("ElevenLabs client not initialized or unavailable.")
+
+    try:
+        response = ELEVEN_CLIENT.text_to_speech.convert_with_timestamps(
+            text=text,
+            voice_id=voice_id,
+            model_id="eleven_multilingual_v2",
+            output_format="mp3_44100_128"
+        )
+
+        with open(output_path, "wb") as f:
+            f.write(base64.b64decode(response.audio_base_64))
+
+        if os.path.getsize(output_path) == 0:
+            raise FileNotFoundError(f"ElevenLabs failed to create audio file for turn {turn_index}.")
+
+        return _alignment_to_words(response.alignment) if response.alignment else None
+
+    except Exception as e:
+        print(f"ElevenLabs API Error for turn {turn_index}: {e}", file=sys.stderr)
+        raise
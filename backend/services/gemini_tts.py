@@ -3,6 +3,7 @@
 import os
 import struct
 import mimetypes
+import threading
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
@@ -99,12 +100,19 @@ def initialize_gemini_client():
 
 # --- Singleton Client ---
 _GEMINI_CLIENT = None
+_GEMINI_CLIENT_LOCK = threading.Lock()
 
 def _get_client():
-    """Returns a cached Gemini client singleton to avoid re-initialization per call."""
+    """Returns a cached Gemini client singleton to avoid re-initialization per call.
+
+    TTS workers call this concurrently; the lock makes sure they all share one
+    client (and its pooled HTTP connections) instead of racing to build several.
+    """
     global _GEMINI_CLIENT
     if _GEMINI_CLIENT is None:
-        _GEMINI_CLIENT = genai.Client(api_key=os.environ.get(GEMINI_API_KEY_NAME))
+        with _GEMINI_CLIENT_LOCK:
+            if _GEMINI_CLIENT is None:
+                _GEMINI_CLIENT = genai.Client(api_key=os.environ.get(GEMINI_API_KEY_NAME))
     return _GEMINI_CLIENT
 
 def is_service_available():
@@ -151,7 +159,7 @@ def generate_audio(text, voice_name, output_path, turn_index, voice_id=None):
     # Use the dedicated TTS model
     TTS_MODEL = "gemini-2.5-flash-preview-tts"
 
-    full_audio_data = b""
+    full_audio_data = bytearray()
     # Default MIME type for the raw PCM audio data streamed from the API
     mime_type = "audio/L16;rate=24000"
 
@@ -184,7 +192,7 @@ def generate_audio(text, voice_name, output_path, turn_index, voice_id=None):
                 raise Exception("Gemini API returned no audio data.")
 
         # Convert the raw PCM data to a complete WAV file format by adding the header
-        wav_data = convert_to_wav(full_audio_data, mime_type)
+        wav_data = convert_to_wav(bytes(full_audio_data), mime_type)
 
         # Save the final WAV file
         try:
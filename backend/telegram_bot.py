@@ -669,8 +669,11 @@ async def characters_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     )
 
 
-async def run_bot_async() -> None:
-    """Asynchronous bot starter to ensure a clean event loop context."""
+async def start_bot_async() -> None:
+    """
+    Runs the bot on the current event loop until the task is cancelled.
+    Lets the bot share the backend's loop instead of needing its own process.
+    """
     if not TELEGRAM_BOT_TOKEN:
         print("TELEGRAM_BOT token not found in environment variables.")
         return
@@ -705,12 +708,19 @@ async def run_bot_async() -> None:
     # print(f"   Authorized users: {len(AUTHORIZED_USERS)} configured")
     # print("   Commands: /help, /reel, /script, /prompts, /characters, /list, /generate, /status")
     
-    # Use run_polling for proper lifecycle management
-    await application.run_polling(poll_interval=3.0, stop_signals=None)
+    # Manual lifecycle (run_polling would try to own the event loop)
+    async with application:
+        await application.start()
+        await application.updater.start_polling(poll_interval=3.0)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await application.updater.stop()
+            await application.stop()
 
 
 def start_bot() -> None:
-    """Starts the bot. This is the entry point for the multiprocessing.Process."""
+    """Starts the bot on its own event loop (standalone entry point)."""
     import signal
     
     # Set up signal handlers for graceful shutdown
@@ -721,7 +731,7 @@ def start_bot() -> None:
     signal.signal(signal.SIGINT, signal_handler)
     
     try:
-        asyncio.run(run_bot_async())
+        asyncio.run(start_bot_async())
     except (KeyboardInterrupt, SystemExit):
         # print("Bot process stopped.")
         pass